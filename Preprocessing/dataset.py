@@ -0,0 +1,201 @@
+"""Helpers to load `Preprocessing/Dataset` (<action>/<sequence>/<frame>.npy) for scripts.
+
+The folder tree can be packed into a DatasetStore (see dataset_store.py) whose
+single memory-mapped segment loads in one mmap instead of ~36,000 file reads:
+
+    python Preprocessing/dataset.py --pack
+
+A packed store records the sequence count and modification time of every
+action folder in `source.json`, and `load_dataset` falls back to the folders
+once they differ. That catches added and removed sequences with one stat per
+action; sequences re-recorded in place only show in the frame files' times,
+which `--verify` (or `load_dataset(verify=True)`) compares as well:
+
+    python Preprocessing/dataset.py --verify
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import ACTIONS, STRIDE, WINDOW_SIZE
+from dataset_store import LOG_FILE, DatasetStore
+from keypoints import N_KEYPOINTS
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dataset')
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dataset.store')
+SOURCE_FILE = 'source.json'  # Signature of the folder tree a store was packed from
+SEQUENCE_LENGTH = 30  # Frames per recorded sequence
+
+
+def load_sequences(data_path=DATA_PATH, actions=ACTIONS):
+    """All recorded sequences as X (N, 30, 258) float32 and y (N,) class indices in `actions` order."""
+    X, y = [], []
+    for label, action in enumerate(actions):
+        action_path = os.path.join(data_path, action)
+        for sequence in sorted(os.listdir(action_path), key=int):
+            frames = [np.load(os.path.join(action_path, sequence, f"{frame_num}.npy")) for frame_num in range(SEQUENCE_LENGTH)]
+            X.append(frames)
+            y.append(label)
+    return np.array(X, dtype=np.float32), np.array(y)
+
+
+def sequence_folders(data_path=DATA_PATH, actions=ACTIONS):
+    """(label, sequence name, folder) of every recorded sequence, in `load_sequences` order."""
+    for label, action in enumerate(actions):
+        action_path = os.path.join(data_path, action)
+        for sequence in sorted(os.listdir(action_path), key=int):
+            yield label, sequence, os.path.join(action_path, sequence)
+
+
+def source_signature(data_path=DATA_PATH, actions=ACTIONS, verify=False):
+    """{action: [sequence count, mtime_ns of the action folder]} of the folder tree.
+
+    With `verify` each entry also gets the newest mtime_ns of any sequence
+    folder or frame file, which takes a stat of every file (~36,000).
+    """
+    signature = {}
+    for action in actions:
+        action_path = os.path.join(data_path, action)
+        sequences = os.listdir(action_path)
+        signature[action] = [len(sequences), os.stat(action_path).st_mtime_ns]
+        if verify:
+            newest = 0
+            for sequence in sequences:
+                sequence_path = os.path.join(action_path, sequence)
+                newest = max(newest, os.stat(sequence_path).st_mtime_ns)
+                for entry in os.scandir(sequence_path):
+                    newest = max(newest, entry.stat().st_mtime_ns)
+            signature[action].append(newest)
+    return signature
+
+
+def import_folders(store, data_path=DATA_PATH, actions=ACTIONS):
+    """Append a <action>/<sequence>/<frame>.npy tree (e.g. an old TestDataset) to a store, one commit per action."""
+    for label, action in enumerate(actions):
+        folders = [folder for folder_label, _, folder in sequence_folders(data_path, [action])]
+        sequences = [[np.load(os.path.join(folder, f"{frame_num}.npy")) for frame_num in range(SEQUENCE_LENGTH)]
+                     for folder in folders]
+        store.add(action, sequences)
+    return store
+
+
+def pack_dataset(data_path=DATA_PATH, out_path=STORE_PATH, actions=ACTIONS):
+    """Build a store from the folder tree as a single (N, 30, 258) segment, keeping the folder numbers as ids."""
+    source = source_signature(data_path, actions, verify=True)
+    folders = list(sequence_folders(data_path, actions))
+    tmp_path = out_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    store = DatasetStore.create(tmp_path, actions, (SEQUENCE_LENGTH, N_KEYPOINTS))
+
+    # Stream the sequences into one file, then commit it with a single log record
+    X = np.lib.format.open_memmap(os.path.join(tmp_path, 'packed.npy'), mode='w+', dtype=np.float32,
+                                  shape=(len(folders), SEQUENCE_LENGTH, N_KEYPOINTS))
+    for row, (_, _, folder) in enumerate(folders):
+        X[row] = [np.load(os.path.join(folder, f"{frame_num}.npy")) for frame_num in range(SEQUENCE_LENGTH)]
+    X.flush()
+    store.add_many([label for label, _, _ in folders], X, ids=[int(sequence) for _, sequence, _ in folders])
+    del X
+    os.remove(os.path.join(tmp_path, 'packed.npy'))
+    with open(os.path.join(tmp_path, SOURCE_FILE), 'w') as f:
+        json.dump(source, f)
+
+    # Swap the finished store in so readers never see a partial one
+    shutil.rmtree(out_path, ignore_errors=True)
+    os.replace(tmp_path, out_path)
+    return DatasetStore(out_path)
+
+
+def store_source(store_path=STORE_PATH):
+    """Signature of the folder tree the store was packed from, or None."""
+    try:
+        with open(os.path.join(store_path, SOURCE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def store_is_current(store_path=STORE_PATH, data_path=DATA_PATH, actions=ACTIONS, verify=False):
+    """Whether the folder tree still has the signature recorded when the store was packed.
+
+    Stores not packed from the folders (e.g. built by merging) and stores
+    without the folders next to them have nothing to compare and count as current.
+    """
+    source = store_source(store_path)
+    if source is None or not os.path.isdir(data_path):
+        return True
+    current = source_signature(data_path, actions, verify)
+    return all(source.get(action, [])[:len(signature)] == signature for action, signature in current.items())
+
+
+def load_dataset(data_path=DATA_PATH, store_path=STORE_PATH, actions=ACTIONS, verify=False):
+    """X, y as `load_sequences`, read from the dataset store (a single mmap once packed) when it is up to date.
+
+    `verify` also compares the times of the frame files (see `source_signature`).
+    """
+    if os.path.exists(os.path.join(store_path, LOG_FILE)):
+        store = DatasetStore(store_path)
+        if store.actions == list(actions):
+            if store_is_current(store_path, data_path, actions, verify):
+                return store.X, store.y
+            print(f"{store_path} is older than {data_path}, loading the folders; "
+                  f"re-pack with `python Preprocessing/dataset.py --pack`", file=sys.stderr)
+    return load_sequences(data_path, actions)
+
+
+def window_view(X, window_size=WINDOW_SIZE, stride=STRIDE):
+    """(N, num_windows, window_size, 258) read-only view of every sliding window of every sequence (no copy)."""
+    num_windows = (X.shape[1] - window_size) // stride + 1
+    s0, s1, s2 = X.strides
+    return np.lib.stride_tricks.as_strided(X, shape=(X.shape[0], num_windows, window_size, X.shape[2]),
+                                           strides=(s0, stride * s1, s1, s2), writeable=False)
+
+
+def make_windows(X, y, window_size=WINDOW_SIZE, stride=STRIDE):
+    """Sliding windows over every sequence, as in Process_Data.ipynb: (N * windows, window_size, 258) copied."""
+    windows = window_view(X, window_size, stride)
+    return windows.reshape(-1, window_size, X.shape[2]), np.repeat(y, windows.shape[1])
+
+
+def model_inputs(X, y, input_shape, stride=STRIDE):
+    """Shape the sequences for a model input: windowed LSTM, full-sequence LSTM or CNN (channel last)."""
+    if input_shape[0] < X.shape[1]:
+        X, y = make_windows(X, y, input_shape[0], stride)
+    return X.reshape((-1,) + tuple(input_shape)), y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pack', action='store_true', help=f'pack {DATA_PATH} into {STORE_PATH}')
+    parser.add_argument('--verify', action='store_true', help='check every frame file against the packed store and exit')
+    args = parser.parse_args()
+
+    if args.verify:
+        start = time.perf_counter()
+        current = store_is_current(verify=True)
+        print(f"{STORE_PATH} is {'up to date' if current else 'stale, re-pack with --pack'} "
+              f"(checked in {time.perf_counter() - start:.2f} s)")
+        sys.exit(0 if current else 1)
+
+    if args.pack:
+        start = time.perf_counter()
+        dataset = pack_dataset()
+        print(f"Packed {len(dataset)} sequences into {STORE_PATH} in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    X, y = load_sequences()
+    walk_s = time.perf_counter() - start
+    start = time.perf_counter()
+    dataset = DatasetStore(STORE_PATH)
+    packed_X = dataset.X
+    mmap_s = time.perf_counter() - start
+    print(f"Folder walk: {walk_s:.2f} s, packed mmap: {mmap_s * 1000:.2f} ms, identical: {np.array_equal(X, packed_X)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Append-only store of recorded keypoint sequences, replacing the <action>/<sequence>/<frame>.npy folders.
+
+A store is a folder with
+
+    segments/<name>.npy   immutable (n, 30, 258) float32 blocks of sequences
+    log.jsonl             one JSON record per commit: init, add or delete
+
+Adding sequences writes one new segment and appends one log line; deleting
+appends a tombstone. Neither touches existing data, so both cost O(new data).
+A commit only exists once its log line is complete: a segment without a log
+line, or a torn last line left by a crash, is ignored on load. Writers take
+a lock file, and sequence ids come from the log (never from listing folders),
+so concurrent collection sessions can't hand out the same id twice.
+"""
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+LOG_FILE = 'log.jsonl'
+SEGMENT_DIR = 'segments'
+LOCK_FILE = 'LOCK'
+LOCK_TIMEOUT = 10  # Seconds to wait for another writer
+SEQUENCE_SHAPE = (30, 258)  # Frames x keypoints of one recorded sequence
+
+
+class DatasetStore:
+    """Sequences keyed by (action, id), read through memory-mapped segments.
+
+    X          (N, 30, 258) float32, live sequences sorted by class then id
+    y          (N,) class indices into `actions`
+    ids        (N,) sequence id of every row
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = os.path.join(path, LOG_FILE)
+        if not os.path.exists(self.log_path):
+            raise FileNotFoundError(f"No dataset store at {path}, create it with DatasetStore.create")
+        self._log_id = None
+        self.refresh()
+
+    def _reset(self):
+        self.actions = None
+        self.sequence_shape = SEQUENCE_SHAPE
+        self._offset = 0  # Bytes of the log already applied
+        self._rows = {}  # (label, id) -> (segment, row)
+        self._next_id = {}  # label -> first unused id (ids are never reused)
+        self._segments = {}  # name -> memmap, opened on first access
+        self._order = None
+
+    @classmethod
+    def create(cls, path, actions, sequence_shape=SEQUENCE_SHAPE):
+        os.makedirs(os.path.join(path, SEGMENT_DIR), exist_ok=True)
+        log_path = os.path.join(path, LOG_FILE)
+        if os.path.exists(log_path):
+            raise FileExistsError(f"{path} is already a dataset store")
+        with open(log_path + '.tmp', 'w') as f:
+            f.write(json.dumps({'op': 'init', 'actions': list(actions), 'shape': list(sequence_shape)}) + '\n')
+        os.replace(log_path + '.tmp', log_path)
+        return cls(path)
+
+    @classmethod
+    def open(cls, path, actions, sequence_shape=SEQUENCE_SHAPE):
+        """The store at `path`, created for `actions` if it doesn't exist yet."""
+        if not os.path.exists(os.path.join(path, LOG_FILE)):
+            return cls.create(path, actions, sequence_shape)
+        store = cls(path)
+        if store.actions != list(actions):
+            raise ValueError(f"{path} was created for different actions: {store.actions}")
+        return store
+
+    # Reading
+
+    def refresh(self):
+        """Apply the commits other writers appended since the last call."""
+        log_id = os.stat(self.log_path).st_ino
+        if log_id != self._log_id:
+            # New store, or the log was replaced by `compact()`: replay from the start
+            self._reset()
+            self._log_id = log_id
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1  # A line without its newline is an unfinished commit
+        for line in data[:end].splitlines():
+            self._apply(json.loads(line))
+        self._offset += end
+
+    def _apply(self, record):
+        op = record['op']
+        if op == 'init':
+            self.actions = record['actions']
+            self.sequence_shape = tuple(record.get('shape', SEQUENCE_SHAPE))
+            self._next_id = {int(label): next_id for label, next_id in record.get('next_ids', {}).items()}
+        elif op == 'add':
+            for row, key in enumerate(zip(record['labels'], record['ids'])):
+                self._rows[key] = (record['segment'], row)
+                self._next_id[key[0]] = max(self._next_id.get(key[0], 0), key[1] + 1)
+        elif op == 'delete':
+            for key in zip(record['labels'], record['ids']):
+                self._rows.pop(key, None)
+        self._order = None
+
+    def keys(self):
+        """(label, id) of every live sequence, sorted."""
+        if self._order is None:
+            self._order = sorted(self._rows)
+        return self._order
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        action, sequence_id = key
+        return (self._label(action), sequence_id) in self._rows
+
+    def _label(self, action):
+        return self.actions.index(action) if isinstance(action, str) else int(action)
+
+    def _segment(self, name):
+        if name not in self._segments:
+            self._segments[name] = np.load(os.path.join(self.path, SEGMENT_DIR, name), mmap_mode='r')
+        return self._segments[name]
+
+    def gather(self, keys):
+        """(len(keys), 30, 258) sequences; a memmap slice when they are consecutive rows of one segment."""
+        locations = [self._rows[key] for key in keys]
+        if not locations:
+            return np.empty((0,) + self.sequence_shape, dtype=np.float32)
+        segment, first = locations[0]
+        if all(location == (segment, first + i) for i, location in enumerate(locations)):
+            return self._segment(segment)[first:first + len(locations)]
+
+        out = np.empty((len(locations),) + self.sequence_shape, dtype=np.float32)
+        by_segment = {}
+        for position, (name, row) in enumerate(locations):
+            by_segment.setdefault(name, ([], []))
+            by_segment[name][0].append(position)
+            by_segment[name][1].append(row)
+        for name, (positions, rows) in by_segment.items():
+            out[positions] = self._segment(name)[rows]
+        return out
+
+    @property
+    def X(self):
+        return self.gather(self.keys())
+
+    @property
+    def y(self):
+        return np.array([label for label, _ in self.keys()], dtype=np.int64)
+
+    @property
+    def ids(self):
+        return np.array([sequence_id for _, sequence_id in self.keys()], dtype=np.int64)
+
+    def __getitem__(self, i):
+        """(sequence, label) of row `i` in X order."""
+        label, sequence_id = self.keys()[i]
+        return self.gather([(label, sequence_id)])[0], label
+
+    def action(self, action):
+        """(X, y) of a single action."""
+        label = self._label(action)
+        keys = [key for key in self.keys() if key[0] == label]
+        return self.gather(keys), np.full(len(keys), label, dtype=np.int64)
+
+    def sequence(self, action, sequence_id):
+        """One (30, 258) sequence."""
+        key = (self._label(action), int(sequence_id))
+        if key not in self._rows:
+            raise KeyError(f"No sequence {sequence_id} for {action!r} in {self.path}")
+        return self.gather([key])[0]
+
+    # Writing
+
+    @contextmanager
+    def _locked(self):
+        lock_path = os.path.join(self.path, LOCK_FILE)
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{lock_path} is held by another writer (delete it if none is running)")
+                time.sleep(0.05)
+        try:
+            self.refresh()
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def _commit(self, record):
+        with open(self.log_path, 'r+b') as f:
+            f.truncate(self._offset)  # Drop the torn line of a crashed writer, if any
+            f.seek(self._offset)
+            f.write((json.dumps(record) + '\n').encode())
+            f.flush()
+            os.fsync(f.fileno())
+        self.refresh()
+
+    def _write_segment(self, sequences):
+        name = f"{uuid.uuid4().hex}.npy"
+        path = os.path.join(self.path, SEGMENT_DIR, name)
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, sequences)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+        return name
+
+    def add_many(self, labels, sequences, ids=None):
+        """Append sequences of any actions in one commit; returns their ids."""
+        sequences = np.asarray(sequences, dtype=np.float32).reshape((-1,) + self.sequence_shape)
+        labels = [self._label(action) for action in labels]
+        if len(labels) != len(sequences):
+            raise ValueError(f"{len(labels)} labels for {len(sequences)} sequences")
+        if not len(labels):
+            return []
+
+        with self._locked():
+            if ids is None:
+                next_id = dict(self._next_id)
+                ids = []
+                for label in labels:
+                    ids.append(next_id.get(label, 0))
+                    next_id[label] = ids[-1] + 1
+            else:
+                ids = [int(sequence_id) for sequence_id in ids]
+                taken = [key for key in zip(labels, ids) if key in self._rows]
+                if taken:
+                    raise ValueError(f"Sequences {taken} already exist in {self.path}")
+            segment = self._write_segment(sequences)
+            self._commit({'op': 'add', 'segment': segment, 'labels': labels, 'ids': ids})
+        return ids
+
+    def add(self, action, sequences):
+        """Append (n, 30, 258) recorded sequences of one action; returns their new ids."""
+        return self.add_many([action] * len(sequences), sequences)
+
+    def delete(self, action, sequence_ids):
+        """Drop bad sequences; their data stays in its segment until `compact()`."""
+        label = self._label(action)
+        with self._locked():
+            keys = [(label, int(sequence_id)) for sequence_id in sequence_ids]
+            missing = [key for key in keys if key not in self._rows]
+            if missing:
+                raise KeyError(f"No sequences {missing} in {self.path}")
+            self._commit({'op': 'delete', 'labels': [label] * len(keys), 'ids': [key[1] for key in keys]})
+
+    def merge(self, other):
+        """Append every live sequence of another store (new ids, actions matched by name)."""
+        keys = other.keys()
+        labels = [other.actions[label] for label, _ in keys]
+        unknown = set(labels) - set(self.actions)
+        if unknown:
+            raise ValueError(f"Actions {sorted(unknown)} are not in {self.path}")
+        return self.add_many(labels, other.gather(keys))
+
+    def compact(self):
+        """Rewrite the live sequences as one segment and a fresh log, reclaiming deleted data (O(N))."""
+        with self._locked():
+            keys = self.keys()
+            segment = self._write_segment(self.gather(keys))
+            records = [{'op': 'init', 'actions': self.actions, 'shape': list(self.sequence_shape),
+                        'next_ids': self._next_id},
+                       {'op': 'add', 'segment': segment, 'labels': [label for label, _ in keys],
+                        'ids': [sequence_id for _, sequence_id in keys]}]
+            with open(self.log_path + '.tmp', 'w') as f:
+                f.writelines(json.dumps(record) + '\n' for record in records)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self.log_path + '.tmp', self.log_path)
+
+            self._segments = {}
+            for name in os.listdir(os.path.join(self.path, SEGMENT_DIR)):
+                if name != segment:
+                    os.remove(os.path.join(self.path, SEGMENT_DIR, name))
+            self.refresh()
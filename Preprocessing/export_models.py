@@ -0,0 +1,184 @@
+"""Convert the Keras models in Preprocessing/Models to TFLite and ONNX, and compare the backends.
+
+Converted files are cached in Models/exported/ under the hash of their source
+`.h5`, so re-running only converts models that changed.
+
+    python Preprocessing/export_models.py            # convert every model
+    python Preprocessing/export_models.py --report   # + agreement per class, latency and memory
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import ACTIONS, MODELS_DIR
+from inference import BACKENDS, EXPORT_FORMATS, exported_path, load_inference_model
+
+MODEL_FILES = ['model_windowed_seq_5.h5', 'model_normal_seq_4.h5', 'model_normal_seq_5.h5', 'model_CNN.h5']
+
+
+def export_tflite(model, out_path, quantization=None, representative_data=None):
+    """Convert to TFLite, optionally post-training quantized ("float16", "dynamic" or "int8")."""
+    import tensorflow as tf
+
+    # Tracing with a fixed (1, ...) signature lets the converter fuse the LSTMs into
+    # builtin kernels; TFLiteModel runs batches window by window
+    run = tf.function(lambda x: model(x, training=False))
+    concrete = run.get_concrete_function(tf.TensorSpec((1,) + tuple(model.input_shape[1:]), tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+
+    if quantization:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]  # "dynamic": int8 weights, float activations
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        # Integer activations need their ranges, calibrated on real keypoint windows;
+        # ops without an int8 kernel stay float and inputs/outputs remain float32
+        converter.representative_dataset = lambda: ([sample[np.newaxis]] for sample in representative_data)
+
+    with open(out_path, 'wb') as f:
+        f.write(converter.convert())
+
+
+def export_onnx(model, out_path):
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name='input'),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=13, output_path=out_path)
+
+
+EXPORTERS = {'tflite': export_tflite, 'onnx': export_onnx}
+
+
+def export_model(source_path, formats=tuple(EXPORT_FORMATS)):
+    """Convert one `.h5` model, reusing cached artifacts whose source hash still matches."""
+    from tensorflow.keras.models import load_model
+
+    model = None
+    artifacts = {}
+    for fmt in formats:
+        out_path = exported_path(source_path, fmt)
+        if not os.path.exists(out_path):
+            model = model or load_model(source_path)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            tmp_path = out_path + '.tmp'
+            EXPORTERS[fmt](model, tmp_path)
+            os.replace(tmp_path, out_path)  # Never leave a half-written artifact under the final name
+            print(f"Exported {out_path}")
+        artifacts[fmt] = out_path
+    return artifacts
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (VmHWM on Linux, current RSS elsewhere via psutil)."""
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    import psutil
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def measure_backend(source_path, backend, calls=200):
+    """Latency and resident memory of one backend; run in a fresh process so runtimes don't mix."""
+    start = time.perf_counter()
+    model = load_inference_model(source_path, backend=backend)
+    load_s = time.perf_counter() - start
+
+    x = np.random.default_rng(0).random((1,) + tuple(model.input_shape), dtype=np.float32)
+    for _ in range(10):
+        model.predict(x)
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        model.predict(x)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'backend': backend, 'load_s': load_s, 'p50_ms': float(np.percentile(timings, 50)),
+            'p95_ms': float(np.percentile(timings, 95)), 'peak_rss_mb': peak_rss_mb()}
+
+
+def agreement_report(source_path, backends):
+    """Per-class top-1 agreement and max |difference| of every backend against the Keras model."""
+    from dataset import load_dataset, model_inputs
+
+    X, y = load_dataset()
+    keras_model = load_inference_model(source_path, backend='keras')
+    inputs, labels = model_inputs(X, y, keras_model.input_shape)
+    reference = keras_model.predict(inputs)
+
+    report = {}
+    for backend in backends:
+        model = load_inference_model(source_path, backend=backend)
+        probs = np.concatenate([model.predict(inputs[i:i + 64]) for i in range(0, len(inputs), 64)])
+        per_class = {}
+        for label, action in enumerate(ACTIONS):
+            rows = labels == label
+            per_class[action] = {
+                'top1_agreement': float(np.mean(probs[rows].argmax(1) == reference[rows].argmax(1))),
+                'max_abs_diff': float(np.abs(probs[rows] - reference[rows]).max()),
+            }
+        report[backend] = {
+            'top1_agreement': float(np.mean(probs.argmax(1) == reference.argmax(1))),
+            'accuracy': float(np.mean(probs.argmax(1) == labels)),
+            'per_class': per_class,
+        }
+    report['keras'] = {'accuracy': float(np.mean(reference.argmax(1) == labels))}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('models', nargs='*', help='model files (default: every model in Preprocessing/Models)')
+    parser.add_argument('--formats', nargs='+', default=list(EXPORT_FORMATS), choices=list(EXPORT_FORMATS))
+    parser.add_argument('--report', action='store_true', help='compare the backends on the Dataset')
+    parser.add_argument('--measure', choices=BACKENDS, help=argparse.SUPPRESS)  # internal: one backend per process
+    args = parser.parse_args()
+
+    models = args.models or [os.path.join(ROOT, MODELS_DIR, name) for name in MODEL_FILES]
+    models = [path for path in models if os.path.exists(path)]
+
+    if args.measure:
+        for path in models:
+            print(json.dumps(measure_backend(path, args.measure)))
+        return
+
+    reports = {}
+    for path in models:
+        export_model(path, args.formats)
+        if not args.report:
+            continue
+
+        name = os.path.basename(path)
+        reports[name] = agreement_report(path, args.formats)
+        reports[name]['performance'] = [
+            json.loads(subprocess.check_output([sys.executable, __file__, path, '--measure', backend]).decode().splitlines()[-1])
+            for backend in ['keras'] + args.formats
+        ]
+
+        print(f"\n{name}  (Keras accuracy {reports[name]['keras']['accuracy']:.3f})")
+        print(f"{'backend':<8} {'agree':>7} {'accuracy':>9} {'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>8}  lowest class agreement")
+        for perf in reports[name]['performance']:
+            backend = perf['backend']
+            stats = reports[name].get(backend, {})
+            worst = min(stats['per_class'].items(), key=lambda item: item[1]['top1_agreement']) if 'per_class' in stats else None
+            print(f"{backend:<8} {stats.get('top1_agreement', 1.0):7.3f} {stats['accuracy']:9.3f} "
+                  f"{perf['p50_ms']:8.3f} {perf['p95_ms']:8.3f} {perf['peak_rss_mb']:8.1f}  "
+                  + (f"{worst[0]} ({worst[1]['top1_agreement']:.3f})" if worst else '-'))
+
+    if reports:
+        out_path = os.path.join(ROOT, MODELS_DIR, 'exported', 'backend_report.json')
+        with open(out_path, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReport written to {out_path}")
+
+
+if __name__ == '__main__':
+    main()
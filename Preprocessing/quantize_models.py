@@ -0,0 +1,147 @@
+"""Post-training quantization of the models in Preprocessing/Models, with an accuracy regression report.
+
+Produces float16, dynamic-range (int8 weights) and int8 (weights and activations,
+calibrated on Dataset windows) TFLite variants next to the other exported models,
+then compares each variant with the original `.h5` on the Dataset: top-1
+accuracy, per-class confusion changes, single-window latency and file size.
+
+    python Preprocessing/quantize_models.py [models ...] [--calibration-samples 300]
+
+Load a variant in the app by setting INFERENCE_QUANTIZATION in the UI functions module.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from export_models import MODEL_FILES, ROOT, export_tflite
+from dataset import load_dataset, model_inputs
+from constants import ACTIONS, MODELS_DIR
+from inference import QUANTIZATIONS, exported_path, load_inference_model
+
+
+def calibration_windows(inputs, samples, seed=0):
+    rng = np.random.default_rng(seed)
+    return inputs[rng.choice(len(inputs), min(samples, len(inputs)), replace=False)]
+
+
+def convert_variant(source_path, quantization, calibration_samples):
+    """Write one quantized variant; runs in a child process (see quantize_model)."""
+    from tensorflow.keras.models import load_model
+
+    keras_model = load_model(source_path)
+    X, y = load_dataset()
+    inputs, _ = model_inputs(X, y, keras_model.input_shape[1:])
+    out_path = exported_path(source_path, 'tflite', quantization)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    export_tflite(keras_model, out_path + '.tmp', quantization, calibration_windows(inputs, calibration_samples))
+    os.replace(out_path + '.tmp', out_path)
+
+
+def quantize_model(source_path, quantizations=QUANTIZATIONS, calibration_samples=300):
+    """Write every missing quantized variant of one model; returns {quantization: path}.
+
+    Each conversion runs in its own process: the TFLite calibrator can crash
+    outright on some LSTM graphs, which must not take the whole report down.
+    """
+    artifacts = {}
+    for quantization in quantizations:
+        out_path = exported_path(source_path, 'tflite', quantization)
+        if not os.path.exists(out_path):
+            command = [sys.executable, os.path.abspath(__file__), source_path, '--convert', quantization,
+                       '--calibration-samples', str(calibration_samples)]
+            if subprocess.run(command).returncode != 0:
+                print(f"{os.path.basename(source_path)}: {quantization} conversion failed, skipped")
+                continue
+            print(f"Exported {out_path}")
+        artifacts[quantization] = out_path
+    return artifacts
+
+
+def latency_ms(model, x, calls=200):
+    for _ in range(10):
+        model.predict(x)
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        model.predict(x)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(timings, 50))
+
+
+def confusion(labels, predictions):
+    matrix = np.zeros((len(ACTIONS), len(ACTIONS)), dtype=int)
+    np.add.at(matrix, (labels, predictions), 1)
+    return matrix
+
+
+def evaluate(model, inputs, labels):
+    predictions = np.concatenate([model.predict(inputs[i:i + 64]) for i in range(0, len(inputs), 64)]).argmax(1)
+    return predictions, confusion(labels, predictions)
+
+
+def confusion_changes(reference, variant, limit=10):
+    """Largest (true, predicted) cell changes between two confusion matrices."""
+    delta = variant - reference
+    cells = sorted(zip(*np.nonzero(delta)), key=lambda cell: -abs(delta[cell]))[:limit]
+    return [{'true': ACTIONS[t], 'predicted': ACTIONS[p], 'change': int(delta[t, p])} for t, p in cells]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('models', nargs='*', help='model files (default: every model in Preprocessing/Models)')
+    parser.add_argument('--quantizations', nargs='+', default=list(QUANTIZATIONS), choices=QUANTIZATIONS)
+    parser.add_argument('--calibration-samples', type=int, default=300, help='Dataset windows used to calibrate int8')
+    parser.add_argument('--convert', choices=QUANTIZATIONS, help=argparse.SUPPRESS)  # internal: one conversion per process
+    args = parser.parse_args()
+
+    if args.convert:
+        convert_variant(args.models[0], args.convert, args.calibration_samples)
+        return
+
+    X, y = load_dataset()
+    models = args.models or [os.path.join(ROOT, MODELS_DIR, name) for name in MODEL_FILES]
+    report = {}
+
+    for source_path in filter(os.path.exists, models):
+        name = os.path.basename(source_path)
+        artifacts = quantize_model(source_path, args.quantizations, args.calibration_samples)
+
+        variants = {'original': (load_inference_model(source_path), source_path)}
+        inputs, labels = model_inputs(X, y, variants['original'][0].input_shape)
+        for quantization, path in artifacts.items():
+            variants[quantization] = (load_inference_model(source_path, quantization=quantization), path)
+
+        reference_predictions, reference_confusion = evaluate(variants['original'][0], inputs, labels)
+        report[name] = {}
+        print(f"\n{name}")
+        print(f"{'variant':<10} {'size KB':>9} {'accuracy':>9} {'agree':>7} {'p50 ms':>8}  worst class change")
+        for variant, (model, path) in variants.items():
+            predictions, matrix = evaluate(model, inputs, labels)
+            per_class = (np.diag(matrix) - np.diag(reference_confusion)) / np.maximum(reference_confusion.sum(1), 1)
+            worst = int(np.argmin(per_class))
+            report[name][variant] = {
+                'size_bytes': os.path.getsize(path),
+                'accuracy': float(np.mean(predictions == labels)),
+                'top1_agreement': float(np.mean(predictions == reference_predictions)),
+                'latency_p50_ms': latency_ms(model, inputs[:1]),
+                'per_class_accuracy_change': dict(zip(ACTIONS, per_class.round(4).tolist())),
+                'confusion_changes': confusion_changes(reference_confusion, matrix),
+            }
+            stats = report[name][variant]
+            print(f"{variant:<10} {stats['size_bytes'] / 1024:9.1f} {stats['accuracy']:9.3f} {stats['top1_agreement']:7.3f} "
+                  f"{stats['latency_p50_ms']:8.3f}  {ACTIONS[worst]} ({per_class[worst]:+.3f})")
+
+    out_path = os.path.join(ROOT, MODELS_DIR, 'exported', 'quantization_report.json')
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {out_path}")
+
+
+if __name__ == '__main__':
+    main()
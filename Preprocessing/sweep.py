@@ -0,0 +1,200 @@
+"""Train and compare a grid of window size / stride / architecture configurations on CPU.
+
+    python Preprocessing/sweep.py --windows 5 10 15 30 --strides 2 5 10 --archs lstm lstm_small conv1d \
+        --workers 4 --epochs 50 --accuracy-floor 0.9
+
+Windowed train/val/test arrays are built once per (window, stride) and cached
+in Models/sweep/ (keyed by the dataset contents); each configuration is
+trained in its own worker process. The table compares test accuracy (per
+window and per recording, averaging its windows like the video page) with
+the per-window inference latency and the time to the first live prediction:
+the frames the camera page's buffer (keypoint_buffer.camera_buffer, which
+also waits for its prediction interval) collects at CAMERA_FPS before its
+first window, plus one inference. With the default interval of 30 frames
+every window up to 30 frames predicts first after one second, so the ranking
+comes down to inference latency.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import ACTIONS, MODELS_DIR
+from dataset import load_dataset, window_view
+from keypoint_buffer import camera_buffer
+from train_pipeline import split_sequences
+
+SWEEP_DIR = os.path.join(ROOT, MODELS_DIR, 'sweep')
+CAMERA_FPS = 30
+ARCHITECTURES = ('lstm', 'lstm_small', 'conv1d')
+
+
+def build_model(arch, input_shape, num_classes):
+    import tensorflow as tf
+    layers = tf.keras.layers
+
+    if arch == 'lstm':  # The windowed model of Process_Data.ipynb
+        hidden = [layers.LSTM(128, return_sequences=True, activation='relu'),
+                  layers.LSTM(64, return_sequences=True, activation='relu'),
+                  layers.LSTM(64, return_sequences=False, activation='relu'),
+                  layers.Dense(64, activation='relu'), layers.Dense(32, activation='relu')]
+    elif arch == 'lstm_small':
+        hidden = [layers.LSTM(64, return_sequences=True, activation='relu'),
+                  layers.LSTM(32, return_sequences=False, activation='relu'),
+                  layers.Dense(32, activation='relu')]
+    elif arch == 'conv1d':
+        hidden = [layers.Conv1D(64, 3, padding='same', activation='relu'),
+                  layers.Conv1D(64, 3, padding='same', activation='relu'),
+                  layers.GlobalAveragePooling1D(), layers.Dense(64, activation='relu')]
+    else:
+        raise ValueError(f"Unknown architecture {arch!r}, expected one of {ARCHITECTURES}")
+    model = tf.keras.Sequential([layers.Input(input_shape)] + hidden + [layers.Dense(num_classes, activation='softmax')])
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+                  loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def prediction_frames(window_size, stride, frames=240):
+    """Frame counts at which the camera page's buffer would predict, over the first `frames` frames."""
+    buffer = camera_buffer(window_size, stride)
+    row = np.zeros(buffer.n_features, dtype=np.float32)
+    due = []
+    for _ in range(frames):
+        buffer.push(row)
+        if buffer.ready():
+            due.append(buffer.frame_count)
+            buffer.advance()
+    return due
+
+
+def dataset_fingerprint(X):
+    digest = hashlib.sha256()
+    for sequence in X:
+        digest.update(np.ascontiguousarray(sequence).data)
+    return digest.hexdigest()[:12]
+
+
+def cached_windows(X, y, splits, window_size, stride, fingerprint):
+    """Paths of the windowed split arrays for one (window, stride), built only if not cached yet."""
+    folder = os.path.join(SWEEP_DIR, f"{fingerprint}_w{window_size}_s{stride}")
+    if os.path.exists(os.path.join(folder, 'done')):
+        return folder
+    os.makedirs(folder, exist_ok=True)
+    for name, rows in zip(('train', 'val', 'test'), splits):
+        windows = window_view(X[rows], window_size, stride)  # (sequences, num_windows, window, 258)
+        np.save(os.path.join(folder, f"X_{name}.npy"), np.ascontiguousarray(windows, dtype=np.float32))
+        np.save(os.path.join(folder, f"y_{name}.npy"), y[rows])
+    open(os.path.join(folder, 'done'), 'w').close()
+    return folder
+
+
+def run_config(folder, window_size, stride, arch, epochs, threads):
+    """Train one configuration in this (worker) process and evaluate it."""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    from inference import CompiledModel
+
+    def split(name):
+        X = np.load(os.path.join(folder, f"X_{name}.npy"), mmap_mode='r')
+        y = np.load(os.path.join(folder, f"y_{name}.npy"))
+        return X, y
+
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = split('train'), split('val'), split('test')
+    num_windows = X_train.shape[1]
+    flat = lambda X, y: (X.reshape((-1,) + X.shape[2:]), np.repeat(y, num_windows))
+
+    tf.keras.utils.set_random_seed(0)
+    model = build_model(arch, X_train.shape[2:], len(ACTIONS))
+    start = time.perf_counter()
+    history = model.fit(*flat(X_train, y_train), validation_data=flat(X_val, y_val), epochs=epochs, batch_size=32,
+                        callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=10,
+                                                                    restore_best_weights=True)], verbose=0)
+    train_s = time.perf_counter() - start
+
+    compiled = CompiledModel(model)
+    X_flat, y_flat = flat(X_test, y_test)
+    probs = compiled.predict(X_flat)
+    window_accuracy = float(np.mean(probs.argmax(1) == y_flat))
+    recording_accuracy = float(np.mean(probs.reshape(len(X_test), num_windows, -1).mean(1).argmax(1) == y_test))
+
+    single = X_flat[:1]
+    for _ in range(10):
+        compiled.predict(single)
+    timings = []
+    for _ in range(100):
+        start = time.perf_counter()
+        compiled.predict(single)
+        timings.append((time.perf_counter() - start) * 1000)
+    latency_ms = float(np.percentile(timings, 50))
+    due = prediction_frames(window_size, stride)
+
+    return {'window': window_size, 'stride': stride, 'arch': arch, 'params': int(model.count_params()),
+            'epochs': len(history.history['loss']), 'train_s': train_s,
+            'window_accuracy': window_accuracy, 'recording_accuracy': recording_accuracy,
+            'latency_ms': latency_ms, 'first_prediction_ms': due[0] / CAMERA_FPS * 1000 + latency_ms,
+            'prediction_period_ms': (due[1] - due[0]) / CAMERA_FPS * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10, 15, 30])
+    parser.add_argument('--strides', type=int, nargs='+', default=[5])
+    parser.add_argument('--archs', nargs='+', default=['lstm'], choices=ARCHITECTURES)
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument('--accuracy-floor', type=float, default=0.9, help='minimum recording accuracy')
+    args = parser.parse_args()
+
+    X, y = load_dataset()
+    splits = split_sequences(y)
+    fingerprint = dataset_fingerprint(X)
+    # A full-length window has a single position, so its stride doesn't matter; strides past the window skip frames
+    configs = sorted({(w, s if w < X.shape[1] else min(args.strides), arch)
+                      for w, s, arch in itertools.product(args.windows, args.strides, args.archs)
+                      if w <= X.shape[1] and (s <= w or w == X.shape[1])})
+    folders = {(w, s): cached_windows(X, y, splits, w, s, fingerprint) for w, s, _ in configs}
+
+    threads = max(1, (os.cpu_count() or 1) // args.workers)  # Split the cores instead of oversubscribing them
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(run_config, folders[w, s], w, s, arch, args.epochs, threads) for w, s, arch in configs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"done: window {result['window']}, stride {result['stride']}, {result['arch']} "
+                  f"({result['train_s']:.0f} s)", flush=True)
+
+    results.sort(key=lambda result: (result['first_prediction_ms'], result['prediction_period_ms']))
+    print(f"\n{'window':>6} {'stride':>6} {'arch':<11} {'params':>8} {'win acc':>8} {'rec acc':>8} "
+          f"{'ms/window':>10} {'first pred ms':>14} {'period ms':>10}")
+    for result in results:
+        print(f"{result['window']:6d} {result['stride']:6d} {result['arch']:<11} {result['params']:8d} "
+              f"{result['window_accuracy']:8.3f} {result['recording_accuracy']:8.3f} "
+              f"{result['latency_ms']:10.3f} {result['first_prediction_ms']:14.1f} {result['prediction_period_ms']:10.1f}")
+
+    passing = [result for result in results if result['recording_accuracy'] >= args.accuracy_floor]
+    if passing:
+        best = passing[0]
+        print(f"\nFastest configuration with recording accuracy >= {args.accuracy_floor}: "
+              f"window {best['window']}, stride {best['stride']}, {best['arch']}")
+    else:
+        print(f"\nNo configuration reaches recording accuracy {args.accuracy_floor}")
+
+    out_path = os.path.join(SWEEP_DIR, 'results.json')
+    with open(out_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {out_path}")
+
+
+if __name__ == '__main__':
+    main()
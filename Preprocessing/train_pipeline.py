@@ -0,0 +1,161 @@
+"""Streaming windowed training input for Keras `fit`, without materialising the overlapping windows.
+
+Windows are zero-copy strided views over the (N, 30, 258) sequences (a memmap
+when the dataset store is packed); only the windows of the current batch are
+copied. WINDOW_SIZE and STRIDE come from constants.py, the same values the app
+slices its inputs with.
+
+    python Preprocessing/train_pipeline.py --benchmark   # input pipeline samples/sec
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import STRIDE, WINDOW_SIZE
+from dataset import load_dataset, window_view
+
+
+def split_sequences(y, val_size=0.1, test_size=0.1, seed=42):
+    """Stratified train/val/test sequence indices, so windows of one recording never end up in two splits."""
+    rng = np.random.default_rng(seed)
+    train, val, test = [], [], []
+    for label in np.unique(y):
+        rows = rng.permutation(np.flatnonzero(y == label))
+        n_val, n_test = round(len(rows) * val_size), round(len(rows) * test_size)
+        val.extend(rows[:n_val])
+        test.extend(rows[n_val:n_val + n_test])
+        train.extend(rows[n_val + n_test:])
+    return np.sort(train), np.sort(val), np.sort(test)
+
+
+class WindowedSequences:
+    """Sliding windows of a set of sequences, addressed by a flat window index.
+
+    `sequences` selects rows of X (e.g. one split) without copying X; window
+    `i` is window `i % num_windows` of the `i // num_windows`-th selected sequence.
+    """
+
+    def __init__(self, X, y, window_size=WINDOW_SIZE, stride=STRIDE, sequences=None, num_classes=None):
+        self.windows = window_view(X, window_size, stride)
+        self.y = np.asarray(y)
+        self.sequences = np.arange(len(X)) if sequences is None else np.asarray(sequences)
+        self.num_windows = self.windows.shape[1]
+        self.num_classes = num_classes or int(self.y.max()) + 1
+        self.window_size = window_size
+
+    def __len__(self):
+        return len(self.sequences) * self.num_windows
+
+    def batch(self, indices, augment=None, augment_prob=0.5, rng=None):
+        """x (len(indices), window_size, 258) float32 and one-hot y for the given window indices."""
+        indices = np.asarray(indices)
+        rows = self.sequences[indices // self.num_windows]
+        x = np.array(self.windows[rows, indices % self.num_windows], dtype=np.float32)  # The only copy
+        if augment is not None:
+            rng = rng or np.random.default_rng()
+            for i in np.flatnonzero(rng.random(len(x)) < augment_prob):
+                x[i] = augment(x[i])
+        y = np.zeros((len(indices), self.num_classes), dtype=np.float32)
+        y[np.arange(len(indices)), self.y[rows]] = 1
+        return x, y
+
+    def iterate(self, batch_size=32, shuffle=True, seed=None, augment=None):
+        """One epoch of (x, y) batches in numpy, e.g. for plain loops and benchmarks."""
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self)) if shuffle else np.arange(len(self))
+        for start in range(0, len(order), batch_size):
+            yield self.batch(order[start:start + batch_size], augment, rng=rng)
+
+    def tf_dataset(self, batch_size=32, shuffle=True, seed=None, augment=None, augment_prob=0.5):
+        """tf.data pipeline for `model.fit`: shuffled window indices, one batch at a time assembled
+        by `batch` and prefetched while the model trains on the previous ones.
+
+        `tf.numpy_function` holds the GIL, so parallel map calls would only contend for it;
+        the overlap with training comes from the prefetch buffer alone."""
+        import tensorflow as tf
+
+        def load(indices):
+            return self.batch(indices, augment, augment_prob)
+
+        def to_tensors(indices):
+            x, y = tf.numpy_function(load, [indices], (tf.float32, tf.float32))
+            x.set_shape((None, self.window_size, self.windows.shape[3]))
+            y.set_shape((None, self.num_classes))
+            return x, y
+
+        dataset = tf.data.Dataset.range(len(self))
+        if shuffle:
+            dataset = dataset.shuffle(len(self), seed=seed, reshuffle_each_iteration=True)
+        return (dataset.batch(batch_size)
+                .map(to_tensors)
+                .prefetch(tf.data.AUTOTUNE))
+
+
+def throughput_callback(batch_size=32):
+    """Keras callback printing the training samples/sec of every epoch."""
+    import tensorflow as tf
+
+    class Throughput(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.samples = 0
+            self.start = time.perf_counter()
+
+        def on_train_batch_end(self, batch, logs=None):
+            self.samples += batch_size  # The last, smaller batch is counted as full
+
+        def on_epoch_end(self, epoch, logs=None):
+            rate = self.samples / (time.perf_counter() - self.start)
+            print(f" - {rate:.0f} samples/s")
+            if logs is not None:
+                logs['samples_per_sec'] = rate
+
+    return Throughput()
+
+
+def measure(batches, limit=None):
+    """Samples/sec of iterating `batches` (numpy or tf.data) with nothing else to do."""
+    samples, start = 0, time.perf_counter()
+    for i, (x, _) in enumerate(batches):
+        samples += len(x)
+        if limit and i + 1 >= limit:
+            break
+    return samples / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--benchmark', action='store_true', help='compare the input pipeline with training speed')
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    X, y = load_dataset()
+    train_idx, _, _ = split_sequences(y)
+    train = WindowedSequences(X, y, sequences=train_idx)
+    print(f"{len(train)} training windows of {WINDOW_SIZE} frames (stride {STRIDE}) from {len(train_idx)} sequences")
+    if not args.benchmark:
+        return
+
+    print(f"numpy batches:    {measure(train.iterate(args.batch_size)):10.0f} samples/s")
+    print(f"tf.data pipeline: {measure(train.tf_dataset(args.batch_size)):10.0f} samples/s")
+
+    # What the model consumes: one epoch of the windowed LSTM from Process_Data.ipynb
+    import tensorflow as tf
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input((WINDOW_SIZE, X.shape[2])),
+        tf.keras.layers.LSTM(128, return_sequences=True, activation='relu'),
+        tf.keras.layers.LSTM(64, return_sequences=True, activation='relu'),
+        tf.keras.layers.LSTM(64, return_sequences=False, activation='relu'),
+        tf.keras.layers.Dense(64, activation='relu'),
+        tf.keras.layers.Dense(32, activation='relu'),
+        tf.keras.layers.Dense(train.num_classes, activation='softmax'),
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['categorical_accuracy'])
+    model.fit(train.tf_dataset(args.batch_size), epochs=1, callbacks=[throughput_callback(args.batch_size)], verbose=2)
+
+
+if __name__ == '__main__':
+    main()
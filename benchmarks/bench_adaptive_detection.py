@@ -0,0 +1,108 @@
+"""Accuracy impact of the adaptive detection rate, replayed on the recorded Dataset sequences.
+
+For every k, each 30-frame sequence is replayed as the real-time page would
+see it with StagePipeline(adaptive=True) detecting every k-th frame: the
+keypoints of the detected frames are kept, the others are interpolated with
+`interpolate_keypoints`, and the windows (aligned to end on a detected frame)
+go through the windowed model. Reported per k: the effective detection rate
+at 30 fps, the detector time that rate allows, the keypoint error of the
+interpolated frames, the window predictions that changed, and the recording
+accuracy (averaging its windows), so a floor can be set for
+`DetectionRate(max_every=...)`.
+
+Run from the repository root:
+    python benchmarks/bench_adaptive_detection.py [--every 1 2 3 4] [--backend onnx] [--floor 0.9]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Preprocessing"))
+from constants import MODELS_DIR, STRIDE, WINDOW_SIZE
+from dataset import load_dataset, window_view
+from inference import BACKENDS, load_inference_model
+from keypoints import interpolate_keypoints
+
+CAMERA_FPS = 30
+
+
+def replay(sequence, every):
+    """The frames of `sequence` from its first detected frame on, with the skipped ones interpolated."""
+    detected = np.arange(len(sequence) - 1, -1, -every)[::-1]  # The newest frame is always a detected one
+    replayed = sequence[detected[0]:].copy()
+    for previous, current in zip(detected[:-1], detected[1:]):
+        if current - previous > 1:
+            interpolate_keypoints(sequence[previous], sequence[current], current - previous - 1,
+                                  out=replayed[previous + 1 - detected[0]:current - detected[0]])
+    return replayed
+
+
+def windows(frames):
+    """Windows of `frames` ending on its newest frame, like the live buffer's."""
+    offset = (len(frames) - WINDOW_SIZE) % STRIDE
+    return window_view(frames[np.newaxis, offset:], WINDOW_SIZE, STRIDE)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--every", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--model", default=os.path.join(ROOT, MODELS_DIR, "model_windowed_seq_5.h5"))
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    parser.add_argument("--floor", type=float, default=0.9, help="minimum recording accuracy")
+    args = parser.parse_args()
+
+    X, y = load_dataset()
+    X = np.asarray(X, dtype=np.float32)
+    model = load_inference_model(args.model, backend=args.backend)
+
+    reference = {}  # Window predictions of the full-rate replay per sequence, newest window first
+    print(f"{len(X)} sequences, windows of {WINDOW_SIZE} frames (stride {STRIDE}), camera at {CAMERA_FPS} fps\n")
+    print(f"{'every':>5} {'detect fps':>10} {'budget ms':>10} {'kp error':>9} {'changed':>8} {'rec acc':>8}")
+    results = []
+    for every in sorted(set([1] + args.every)):
+        errors, changed, compared, correct = [], 0, 0, 0
+        for i, sequence in enumerate(X):
+            frames = replay(sequence, every)
+            skipped = np.ones(len(frames), dtype=bool)
+            skipped[::every] = False
+            if skipped.any():
+                truth = sequence[len(sequence) - len(frames):][skipped]
+                both = (truth != 0) & (frames[skipped] != 0)  # Missing parts aren't an interpolation error
+                errors.append(np.abs(frames[skipped] - truth)[both])
+
+            probs = model.predict(np.ascontiguousarray(windows(frames)))
+            labels = probs.argmax(1)[::-1]  # Newest window first
+            if every == 1:
+                reference[i] = labels
+            else:
+                overlap = min(len(labels), len(reference[i]))
+                changed += int(np.sum(labels[:overlap] != reference[i][:overlap]))
+                compared += overlap
+            correct += int(probs.mean(0).argmax() == y[i])
+
+        error = float(np.concatenate(errors).mean()) if errors else 0.0
+        result = {"every": every, "detection_fps": CAMERA_FPS / every, "budget_ms": every * 1000 / CAMERA_FPS,
+                  "keypoint_error": error, "changed": changed / compared if compared else 0.0,
+                  "recording_accuracy": correct / len(X)}
+        results.append(result)
+        print(f"{every:5d} {result['detection_fps']:10.1f} {result['budget_ms']:10.1f} {error:9.4f} "
+              f"{result['changed']:8.1%} {result['recording_accuracy']:8.3f}", flush=True)
+
+    passing = []
+    for result in results:
+        if result["recording_accuracy"] < args.floor:
+            break
+        passing.append(result["every"])
+    if passing:
+        print(f"\nRecording accuracy stays >= {args.floor} up to every {passing[-1]}: "
+              f"use DetectionRate(max_every={passing[-1]})")
+    else:
+        print(f"\nNo rate reaches recording accuracy {args.floor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Per-frame CPU time and memory of the color handling between capture, MediaPipe and the preview.
+
+Only the color path is timed, not decoding or the detector itself:
+
+    before      new array per captured frame; mediapipe_detection converts BGR->RGB and back
+                to BGR (discarded); update_camera_feed converts BGR->RGB again for the QImage
+    webcam      frame_sources: decoded into a pooled buffer and swapped to RGB in place once;
+                the detector gets a read-only view; the QImage wraps the same buffer
+    realsense   as webcam, but the camera streams rgb8: a copy into the pooled buffer, no conversion
+
+Run from the repository root:
+    python benchmarks/bench_color_path.py [--frames 300] [--sizes 640x480 1280x720]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frame_sources import FramePool
+
+try:
+    from PySide6.QtGui import QImage
+except ImportError:
+    QImage = None
+
+
+def to_qimage(rgb):
+    if QImage is None:
+        return rgb
+    height, width, channel = rgb.shape
+    return QImage(rgb.data, width, height, rgb.strides[0], QImage.Format_RGB888)
+
+
+def before(decoded, pool):
+    frame = decoded.copy()  # cap.read() / np.array(color_frame.get_data()): a new array per frame
+    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    image.flags.writeable = False
+    # model.process(image)
+    image.flags.writeable = True
+    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return to_qimage(frame_rgb)
+
+
+def webcam(decoded, pool):
+    frame = pool.acquire(decoded.shape)
+    np.copyto(frame, decoded)  # cap.read(buffer) decodes into the pooled buffer
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+    view = frame.view()
+    view.flags.writeable = False
+    # model.process(view)
+    image = to_qimage(frame)
+    pool.release(frame)  # The pipeline's last holder, once painted
+    return image
+
+
+def realsense(decoded, pool):
+    frame = pool.acquire(decoded.shape)
+    np.copyto(frame, decoded)  # rgb8 frame data into the pooled buffer
+    view = frame.view()
+    view.flags.writeable = False
+    # model.process(view)
+    image = to_qimage(frame)
+    pool.release(frame)  # The pipeline's last holder, once painted
+    return image
+
+
+def measure(path, decoded, frames):
+    pool = FramePool()
+    for _ in range(10):
+        path(decoded, pool)
+    cpu, peaks = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            start = time.process_time()
+            path(decoded, pool)
+            cpu.append(time.process_time() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    # process_time has a coarse resolution on some platforms: report the mean, not percentiles
+    return np.mean(cpu) * 1e6, np.mean(peaks) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1280x720"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"QImage: {'PySide6' if QImage is not None else 'not available, display wrap skipped'}\n")
+    print(f"{'size':<10} {'path':<10} {'cpu us/frame':>13} {'allocated MB/frame':>19}")
+    for size in args.sizes:
+        width, height = map(int, size.split("x"))
+        decoded = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        for name, path in (("before", before), ("webcam", webcam), ("realsense", realsense)):
+            cpu_us, allocated_mb = measure(path, decoded, args.frames)
+            print(f"{size:<10} {name:<10} {cpu_us:13.0f} {allocated_mb:19.2f}")
+
+
+if __name__ == "__main__":
+    main()
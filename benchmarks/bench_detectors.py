@@ -0,0 +1,138 @@
+"""Holistic vs the MediaPipe Tasks pose + hand landmarkers on recorded clips.
+
+Every frame of the fixtures goes through both detectors (VIDEO mode, i.e. with
+tracking, like the camera and video pages). Reported:
+
+    latency      per-frame detection time, BGR->RGB included (p50/p95 ms)
+    pose         mean |dx|, |dy| of the pose landmarks where both found a pose
+    hands        agreement on whether each hand is present, and mean |dx|, |dy| where both found it
+    windows      share of windowed-model predictions that agree (with --model)
+    live stream  frames/s the Tasks landmarkers complete in LIVE_STREAM mode, fed as fast as possible
+
+Run from the repository root:
+    python benchmarks/bench_detectors.py [VIDEO_OR_DIR ...] [--pose-model lite] [--model ...] [--backend onnx]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bench_pipeline import FIXTURES_DIR, list_fixtures
+from constants import STRIDE, WINDOW_SIZE
+from detection import mediapipe_detection, open_detector
+from inference import BACKENDS, load_inference_model
+from keypoints import HAND_SIZE, N_KEYPOINTS, POSE_SIZE, extract_keypoints_into
+
+PARTS = {"left hand": slice(POSE_SIZE, POSE_SIZE + HAND_SIZE), "right hand": slice(POSE_SIZE + HAND_SIZE, N_KEYPOINTS)}
+
+
+def run(path, detector, resolution=None):
+    """(frames, 258) keypoints and per-frame detection times in ms."""
+    cap = cv2.VideoCapture(path)
+    keypoints, timings = [], []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            _, results = mediapipe_detection(frame, detector, resolution)
+            timings.append((time.perf_counter() - start) * 1000)
+            keypoints.append(extract_keypoints_into(results, np.empty(N_KEYPOINTS, dtype=np.float32)))
+    finally:
+        cap.release()
+    return np.array(keypoints).reshape(-1, N_KEYPOINTS), np.array(timings)
+
+
+def live_stream_fps(path, pose_model):
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    with open_detector("tasks", running_mode="live_stream", pose_model=pose_model) as detector:
+        start = time.perf_counter()
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            detector.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            frames += 1
+        elapsed = time.perf_counter() - start
+        completed = detector.completed
+    cap.release()
+    return completed / elapsed, completed, frames
+
+
+def xy_error(a, b, n_values):
+    """Mean |dx|, |dy| between two (frames, n * n_values) blocks, over the frames where both are present."""
+    both = a.any(1) & b.any(1)
+    if not both.any():
+        return None
+    diff = np.abs(a[both].reshape(-1, n_values)[:, :2] - b[both].reshape(-1, n_values)[:, :2])
+    return diff.mean(0)
+
+
+def window_labels(model, keypoints):
+    starts = range(0, len(keypoints) - WINDOW_SIZE + 1, STRIDE)
+    if not starts:
+        return np.empty(0, dtype=int)
+    windows = np.stack([keypoints[start:start + WINDOW_SIZE] for start in starts])
+    return model.predict(windows).argmax(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", default=[FIXTURES_DIR], help="videos or folders of videos")
+    parser.add_argument("--pose-model", default="lite", choices=("lite", "full", "heavy"))
+    parser.add_argument("--model", help="windowed model to compare predictions with, e.g. "
+                                        "Preprocessing/Models/model_windowed_seq_5.h5")
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    args = parser.parse_args()
+
+    videos = list_fixtures(args.fixtures)
+    if not videos:
+        sys.exit(f"No fixture videos found in {', '.join(args.fixtures)}")
+    model = load_inference_model(args.model, backend=args.backend) if args.model else None
+
+    keypoints, timings = {"holistic": [], "tasks": []}, {"holistic": [], "tasks": []}
+    for path in videos:
+        for name, options in (("holistic", {}), ("tasks", {"pose_model": args.pose_model})):
+            with open_detector(name, **options) as detector:
+                video_keypoints, video_timings = run(path, detector)
+            keypoints[name].append(video_keypoints)
+            timings[name].append(video_timings)
+        print(f"{os.path.basename(path)}: {len(keypoints['holistic'][-1])} frames", flush=True)
+
+    print(f"\n{'detector':<10} {'p50 ms':>8} {'p95 ms':>8}")
+    for name in ("holistic", "tasks"):
+        ms = np.concatenate(timings[name])
+        print(f"{name:<10} {np.percentile(ms, 50):8.2f} {np.percentile(ms, 95):8.2f}")
+
+    holistic, tasks = np.concatenate(keypoints["holistic"]), np.concatenate(keypoints["tasks"])
+    print(f"\nAgreement of the Tasks landmarkers ({args.pose_model} pose) with Holistic over {len(holistic)} frames:")
+    pose = xy_error(holistic[:, :POSE_SIZE], tasks[:, :POSE_SIZE], 4)
+    presence = (holistic[:, :POSE_SIZE].any(1) == tasks[:, :POSE_SIZE].any(1)).mean()
+    print(f"  pose        presence {presence:6.1%}" + (f"   |dx| {pose[0]:.4f} |dy| {pose[1]:.4f}" if pose is not None else ""))
+    for part, columns in PARTS.items():
+        presence = (holistic[:, columns].any(1) == tasks[:, columns].any(1)).mean()
+        error = xy_error(holistic[:, columns], tasks[:, columns], 3)
+        print(f"  {part:<11} presence {presence:6.1%}" + (f"   |dx| {error[0]:.4f} |dy| {error[1]:.4f}" if error is not None else ""))
+
+    if model is not None:
+        agree = total = 0
+        for a, b in zip(keypoints["holistic"], keypoints["tasks"]):
+            labels_a, labels_b = window_labels(model, a), window_labels(model, b)
+            agree += int(np.sum(labels_a == labels_b))
+            total += len(labels_a)
+        if total:
+            print(f"  windows     {agree / total:6.1%} of {total} predictions agree")
+
+    fps, completed, frames = live_stream_fps(videos[0], args.pose_model)
+    print(f"\nLIVE_STREAM: {fps:.1f} frames/s completed ({completed} of {frames} frames submitted as fast as possible)")
+
+
+if __name__ == "__main__":
+    main()
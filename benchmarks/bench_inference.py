@@ -0,0 +1,69 @@
+"""Per-call latency of Keras `predict`, direct `__call__` and the traced/XLA path of inference.py.
+
+Run from the repository root:
+    python benchmarks/bench_inference.py [--calls 200] [--batch 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Preprocessing"))
+from constants import MODELS_DIR
+from export_models import MODEL_FILES
+from inference import CompiledModel
+from tensorflow.keras.models import load_model
+
+
+def time_calls(fn, x, calls, warmup=10):
+    for _ in range(warmup):
+        fn(x)
+    timings = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(x)
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=5, help="windows per batch call (a 30-frame video gives 5)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'model':<26} {'path':<14} {'input':<16} {'p50 ms':>8} {'p95 ms':>8}")
+    for name in MODEL_FILES:
+        path = os.path.join(ROOT, MODELS_DIR, name)
+        if not os.path.exists(path):
+            print(f"{name:<26} (missing, skipped)")
+            continue
+
+        keras_model = load_model(path)
+        variants = {
+            "predict": CompiledModel(keras_model, mode="predict"),
+            "call": CompiledModel(keras_model, mode="call"),
+            "compiled": CompiledModel(keras_model, mode="compiled"),
+            "compiled+xla": CompiledModel(keras_model, mode="compiled", jit_compile=True),
+        }
+        inputs = {
+            "single": rng.random((1,) + variants["call"].input_shape, dtype=np.float32),
+            f"batch {args.batch}": rng.random((args.batch,) + variants["call"].input_shape, dtype=np.float32),
+        }
+
+        reference = {key: keras_model.predict(x, verbose=0) for key, x in inputs.items()}
+        for label, wrapper in variants.items():
+            fn = (lambda x: wrapper.predict(x, verbose=0)) if label == "predict" else wrapper.predict
+            for key, x in inputs.items():
+                np.testing.assert_allclose(fn(x), reference[key], rtol=1e-4, atol=1e-5)
+                timings = time_calls(fn, x, args.calls)
+                print(f"{name:<26} {label:<14} {key:<16} {np.percentile(timings, 50):8.3f} {np.percentile(timings, 95):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Micro-benchmark: list-comprehension extract_keypoints vs the buffer-filling fast path.
+
+Run from the repository root:
+    python benchmarks/bench_keypoints.py
+"""
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from keypoints import N_KEYPOINTS, extract_keypoints, extract_keypoints_batch, extract_keypoints_into
+
+
+def extract_keypoints_reference(results):
+    """The original implementation from ui_functions.py / Create_Data.ipynb."""
+    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33 * 4)
+    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21 * 3)
+    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21 * 3)
+    return np.concatenate([pose, lh, rh])
+
+
+def fake_landmarks(rng, count, visibility):
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, v in rng.random((count, 4), dtype=np.float32):
+        lm = landmarks.landmark.add(x=x, y=y, z=z - 0.5)
+        if visibility:
+            lm.visibility = v
+    return landmarks
+
+
+def fake_results(rng, left=True, right=True):
+    return SimpleNamespace(
+        pose_landmarks=fake_landmarks(rng, 33, visibility=True),
+        left_hand_landmarks=fake_landmarks(rng, 21, visibility=False) if left else None,
+        right_hand_landmarks=fake_landmarks(rng, 21, visibility=False) if right else None,
+    )
+
+
+def main(n_frames=300, repeat=5):
+    rng = np.random.default_rng(0)
+    frames = [fake_results(rng, left=i % 3 != 0, right=i % 5 != 0) for i in range(n_frames)]
+
+    # Output must match the original bit for bit (float64 and float32)
+    buffer = np.empty(N_KEYPOINTS, dtype=np.float32)
+    for results in frames:
+        expected = extract_keypoints_reference(results)
+        assert np.array_equal(extract_keypoints(results), expected)
+        assert np.array_equal(extract_keypoints_into(results, buffer), expected.astype(np.float32))
+    assert np.array_equal(extract_keypoints_batch(frames), np.array([extract_keypoints_reference(r) for r in frames], dtype=np.float32))
+    print(f"Output identical to reference on {n_frames} frames")
+
+    batch_out = np.empty((n_frames, N_KEYPOINTS), dtype=np.float32)
+    cases = {
+        "reference extract_keypoints": lambda: [extract_keypoints_reference(r) for r in frames],
+        "extract_keypoints": lambda: [extract_keypoints(r) for r in frames],
+        "extract_keypoints_into": lambda: [extract_keypoints_into(r, buffer) for r in frames],
+        "extract_keypoints_batch": lambda: extract_keypoints_batch(frames, out=batch_out),
+    }
+    baseline = None
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat)) / n_frames * 1e6
+        baseline = baseline or best
+        print(f"{name:<30} {best:8.2f} us/frame  ({baseline / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Per-frame cost of the landmark overlay, next to the detector's.
+
+    mp_drawing   the old draw_styled_landmarks: mp_drawing.draw_landmarks on the Holistic protos
+    overlay      landmark_overlay.draw_keypoints on the 258-float keypoint vector
+    detector     mediapipe_detection on the same frames, the cost the overlay must stay well below
+
+The skeletons are a full pose and both hands (every landmark visible), the
+most the overlay ever draws. The frames come from VIDEO if given, otherwise
+they are noise, on which the detector finds nobody and is faster than on a
+signer.
+
+Run from the repository root:
+    python benchmarks/bench_overlay.py [VIDEO] [--frames 300] [--sizes 640x480 1280x720] [--detector tasks]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from detection import DETECTORS, LandmarkResults, mediapipe_detection_rgb, open_detector
+from keypoints import HAND_LANDMARKS, POSE_LANDMARKS
+from landmark_overlay import draw_keypoints
+
+mp_holistic = mp.solutions.holistic
+mp_drawing = mp.solutions.drawing_utils
+
+
+def skeleton(rng):
+    """(258,) keypoints with every landmark inside the image and visible."""
+    pose = np.column_stack([rng.uniform(0.2, 0.8, (POSE_LANDMARKS, 3)), np.ones(POSE_LANDMARKS)])
+    hands = rng.uniform(0.2, 0.8, (2, HAND_LANDMARKS, 3))
+    return np.concatenate([pose.ravel(), hands.ravel()]).astype(np.float32)
+
+
+def draw_styled_landmarks(image, results):
+    mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS,
+                              mp_drawing.DrawingSpec(color=(80, 22, 10), thickness=1, circle_radius=3),
+                              mp_drawing.DrawingSpec(color=(80, 44, 121), thickness=1, circle_radius=2))
+    mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS,
+                              mp_drawing.DrawingSpec(color=(121, 22, 76), thickness=1, circle_radius=3),
+                              mp_drawing.DrawingSpec(color=(121, 44, 250), thickness=1, circle_radius=1))
+    mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS,
+                              mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=1, circle_radius=3),
+                              mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=1, circle_radius=1))
+
+
+def read_frames(path, size, count, rng):
+    width, height = size
+    if path is None:
+        return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(min(count, 30))]
+    frames = []
+    cap = cv2.VideoCapture(path)
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB))
+    cap.release()
+    if not frames:
+        sys.exit(f"Cannot read {path}")
+    return frames
+
+
+def percentiles(ms):
+    return np.percentile(ms, 50), np.percentile(ms, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1280x720"])
+    parser.add_argument("--detector", default=None, choices=DETECTORS, help="default: constants.DETECTOR")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    keypoints = [skeleton(rng) for _ in range(30)]
+    protos = []
+    for row in keypoints:
+        results = LandmarkResults(row)
+        protos.append(type("Results", (), {"pose_landmarks": results.pose_landmarks,
+                                           "left_hand_landmarks": results.left_hand_landmarks,
+                                           "right_hand_landmarks": results.right_hand_landmarks}))
+
+    print(f"{'size':<10} {'path':<11} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in args.sizes:
+        width, height = map(int, size.split("x"))
+        frames = read_frames(args.video, (width, height), args.frames, rng)
+        image = np.empty_like(frames[0])
+        timings = {"mp_drawing": [], "overlay": [], "detector": []}
+        for i in range(args.frames):
+            np.copyto(image, frames[i % len(frames)])
+            start = time.perf_counter()
+            draw_styled_landmarks(image, protos[i % len(protos)])
+            timings["mp_drawing"].append((time.perf_counter() - start) * 1000)
+
+            np.copyto(image, frames[i % len(frames)])
+            start = time.perf_counter()
+            draw_keypoints(image, keypoints[i % len(keypoints)])
+            timings["overlay"].append((time.perf_counter() - start) * 1000)
+
+        with open_detector(args.detector) as detector:
+            for i in range(min(args.frames, 100)):
+                start = time.perf_counter()
+                mediapipe_detection_rgb(frames[i % len(frames)], detector)
+                timings["detector"].append((time.perf_counter() - start) * 1000)
+
+        for name, ms in timings.items():
+            p50, p95 = percentiles(ms)
+            print(f"{size:<10} {name:<11} {p50:8.3f} {p95:8.3f}", flush=True)
+        overlay, detector = np.median(timings["overlay"]), np.median(timings["detector"])
+        print(f"{size:<10} overlay is {overlay / detector:.1%} of the detector, "
+              f"{np.median(timings['mp_drawing']) / overlay:.1f}x faster than mp_drawing\n")
+
+
+if __name__ == "__main__":
+    main()
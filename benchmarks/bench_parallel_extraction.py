@@ -0,0 +1,70 @@
+"""Wall time of parallel_extraction.extract_video_keypoints from 1 to N worker processes.
+
+Run from the repository root:
+    python benchmarks/bench_parallel_extraction.py VIDEO [--frames 300] [--workers 1 2 4 8] [--chunk-frames 60]
+
+Every worker count is compared against the sequential (in-process) result:
+"max diff" is the largest keypoint difference, 0 unless a worker's output
+depends on something other than its chunk, and "hands" the fraction of
+frames where both runs agree on which hands were detected.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from keypoints import HAND_SIZE, POSE_SIZE
+from parallel_extraction import CHUNK_FRAMES, OVERLAP_FRAMES, extract_video_keypoints, get_pool, shutdown_pool
+from video_io import open_video, sample_indices
+
+
+def hands_present(keypoints):
+    left = keypoints[:, POSE_SIZE:POSE_SIZE + HAND_SIZE].any(axis=1)
+    right = keypoints[:, POSE_SIZE + HAND_SIZE:].any(axis=1)
+    return np.stack([left, right], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=None, help="sampled frames (default: every frame)")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts to time (default: powers of two up to the core count)")
+    parser.add_argument("--overlap", type=int, default=OVERLAP_FRAMES, help="warm-up frames before each chunk")
+    parser.add_argument("--chunk-frames", type=int, default=CHUNK_FRAMES, help="frames per chunk")
+    args = parser.parse_args()
+
+    video = open_video(args.video)
+    indices = sample_indices(len(video), args.frames) if args.frames else list(range(len(video)))
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+    print(f"{video}, {len(indices)} sampled frames, {cores} cores")
+
+    start = time.perf_counter()
+    reference = extract_video_keypoints(video, indices, workers=1, overlap=args.overlap, chunk_frames=args.chunk_frames)
+    sequential_s = time.perf_counter() - start
+    reference_hands = hands_present(reference)
+
+    print(f"{'workers':>7} {'seconds':>8} {'frames/s':>9} {'speedup':>8} {'max diff':>9} {'hands':>6}")
+    print(f"{'seq':>7} {sequential_s:8.2f} {len(reference) / sequential_s:9.1f} {1.0:8.2f} {0.0:9.4f} {1.0:6.3f}")
+    for workers in worker_counts:
+        if workers > 1:
+            # Start the processes and import MediaPipe outside the timed region
+            pool = get_pool(workers)
+            list(pool.map(int, range(workers)))
+        start = time.perf_counter()
+        keypoints = extract_video_keypoints(video, indices, workers=workers, overlap=args.overlap,
+                                            chunk_frames=args.chunk_frames)
+        seconds = time.perf_counter() - start
+        max_diff = float(np.abs(keypoints - reference).max()) if len(keypoints) == len(reference) else float("nan")
+        hands = float(np.mean(np.all(hands_present(keypoints) == reference_hands, axis=1)))
+        print(f"{workers:7d} {seconds:8.2f} {len(keypoints) / seconds:9.1f} {sequential_s / seconds:8.2f} "
+              f"{max_diff:9.4f} {hands:6.3f}")
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""End-to-end per-stage latency of the real-time page, replayed headlessly from recorded videos.
+
+Every frame of the fixtures goes through the same stages as CameraThread and
+update_camera_feed, timed one by one:
+
+    decode      cv2.VideoCapture.read
+    cvtcolor    BGR->RGB in place as frame_sources does, and the downscale to DETECTION_RESOLUTION
+    holistic    Holistic.process
+    keypoints   extract_keypoints_into the KeypointRingBuffer
+    window      commit + ready + copy_window
+    predict     model.predict on each full window
+    display     QImage wrapping the RGB frame in update_camera_feed (nothing without PySide6)
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py [VIDEO_OR_DIR ...] [--backend onnx] [--output results.json]
+    python benchmarks/bench_pipeline.py --save-baseline          # store the reference results
+    python benchmarks/bench_pipeline.py --threshold 0.15         # exit 1 on >15% regressions
+
+Fixtures default to benchmarks/fixtures/, whose clips are named <action>_<anything>
+after the sign they show; the most frequent prediction on each is reported
+next to that label. Comparing against a missing baseline is an error.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import ACTIONS, MODELS_DIR
+from detection import detection_image, open_holistic
+from inference import BACKENDS, load_inference_model
+from keypoint_buffer import camera_buffer
+from keypoints import extract_keypoints_into
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+STAGES = ("decode", "cvtcolor", "holistic", "keypoints", "window", "predict", "display")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+
+try:
+    from PySide6.QtGui import QImage
+except ImportError:
+    QImage = None
+
+
+def list_fixtures(paths):
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            videos += sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(VIDEO_EXTENSIONS))
+        elif os.path.exists(path):
+            videos.append(path)
+    return videos
+
+
+def fixture_label(path):
+    """The action a fixture is named after, or None."""
+    action = os.path.basename(path).split("_")[0]
+    return action if action in ACTIONS else None
+
+
+def to_display(image):
+    """What update_camera_feed does before setPixmap."""
+    if QImage is not None:
+        height, width, channel = image.shape
+        return QImage(image.data, width, height, image.strides[0], QImage.Format_RGB888)
+    return image
+
+
+def replay(path, detector, model, timings):
+    """Run every frame of one video through the stages; returns the number of frames and the predicted classes."""
+    buffer = camera_buffer()
+    clock = time.perf_counter_ns
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    predictions = []
+    try:
+        while True:
+            t0 = clock()
+            ret, frame = cap.read()
+            t1 = clock()
+            if not ret:
+                break
+            timings["decode"].append(t1 - t0)
+
+            # The frame source's RGB swap, then mediapipe_detection_rgb split into its downscale and the detector call
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+            rgb = detection_image(image).view()
+            rgb.flags.writeable = False
+            t2 = clock()
+            results = detector.process(rgb)
+            t4 = clock()
+            timings["cvtcolor"].append(t2 - t1)
+            timings["holistic"].append(t4 - t2)
+
+            extract_keypoints_into(results, buffer.reserve())
+            t5 = clock()
+            timings["keypoints"].append(t5 - t4)
+
+            buffer.commit()
+            window = buffer.copy_window() if buffer.ready() else None
+            if window is not None:
+                buffer.advance()
+            t6 = clock()
+            timings["window"].append(t6 - t5)
+
+            if window is not None:
+                predictions.append(int(np.argmax(model.predict(window[np.newaxis])[0])))
+                t7 = clock()
+                timings["predict"].append(t7 - t6)
+
+            t8 = clock()
+            to_display(image)
+            timings["display"].append(clock() - t8)
+            frames += 1
+    finally:
+        cap.release()
+    return frames, predictions
+
+
+def summarize(samples_ns):
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    if not len(ms):
+        return None
+    return {"count": int(len(ms)), "mean_ms": float(ms.mean()), "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)), "p99_ms": float(np.percentile(ms, 99))}
+
+
+def environment():
+    import mediapipe
+    env = {"python": platform.python_version(), "platform": platform.platform(), "numpy": np.__version__,
+           "opencv": cv2.__version__, "mediapipe": mediapipe.__version__, "qimage": QImage is not None}
+    try:
+        import tensorflow
+        env["tensorflow"] = tensorflow.__version__
+    except ImportError:
+        pass
+    return env
+
+
+def compare(results, baseline, threshold, min_delta_ms=0.05):
+    """Stage percentiles (and fps) that got worse than the baseline by more than `threshold`.
+
+    Differences under `min_delta_ms` are timer noise on the microsecond stages and never count.
+    """
+    regressions = []
+    for stage, stats in results["stages"].items():
+        reference = baseline["stages"].get(stage)
+        if not stats or not reference:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if stats[key] > reference[key] * (1 + threshold) and stats[key] - reference[key] > min_delta_ms:
+                regressions.append(f"{stage} {key}: {reference[key]:.3f} -> {stats[key]:.3f} "
+                                   f"(+{(stats[key] / reference[key] - 1) * 100:.0f}%)")
+    if results["fps"] < baseline["fps"] * (1 - threshold):
+        regressions.append(f"fps: {baseline['fps']:.1f} -> {results['fps']:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", default=[FIXTURES_DIR], help="videos or folders of videos")
+    parser.add_argument("--model", default=os.path.join(ROOT, MODELS_DIR, "model_windowed_seq_5.h5"))
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="tolerated slowdown vs the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore smaller absolute slowdowns")
+    args = parser.parse_args()
+
+    videos = list_fixtures(args.fixtures)
+    if not videos:
+        sys.exit(f"No fixture videos found in {', '.join(args.fixtures)}")
+
+    model = load_inference_model(args.model, backend=args.backend)
+    timings = {stage: [] for stage in STAGES}
+    frames = 0
+    labels = {}
+    with open_holistic() as detector:
+        start = time.perf_counter()
+        for path in videos:
+            video_frames, predictions = replay(path, detector, model, timings)
+            frames += video_frames
+            predicted = ACTIONS[np.bincount(predictions).argmax()] if predictions else None
+            labels[os.path.basename(path)] = {"label": fixture_label(path), "predicted": predicted}
+        elapsed = time.perf_counter() - start
+
+    results = {"environment": environment(), "backend": args.backend, "model": os.path.basename(args.model),
+               "fixtures": [os.path.basename(path) for path in videos], "frames": frames, "fps": frames / elapsed, "labels": labels,
+               "stages": {stage: summarize(samples) for stage, samples in timings.items()}}
+
+    print(f"{frames} frames from {len(videos)} fixture(s): {results['fps']:.1f} frames/s end to end")
+    for name, label in labels.items():
+        print(f"  {name}: label {label['label']}, predicted {label['predicted']}")
+    print(f"{'stage':<10} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for stage, stats in results["stages"].items():
+        if stats:
+            print(f"{stage:<10} {stats['count']:6d} {stats['p50_ms']:8.3f} {stats['p95_ms']:8.3f} {stats['p99_ms']:8.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}, record one with --save-baseline")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["fixtures"] != results["fixtures"]:
+        print("Warning: the baseline was recorded on different fixtures")
+    if baseline["backend"] != results["backend"]:
+        print(f"Warning: the baseline was recorded with the {baseline['backend']} backend")
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%} against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regression beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Detection latency vs keypoint error and classification at reduced inference resolutions.
+
+Every frame of the fixtures goes through Holistic at each inference resolution
+(longest image side, see constants.DETECTION_RESOLUTION) and is compared with
+full resolution:
+
+    latency     downscale + BGR->RGB + detection per frame (p50/p95 ms)
+    pose/hands  presence agreement and mean |dx|, |dy| where both found the part
+    windows     windowed-model predictions that agree with full resolution
+    accuracy    video-page prediction (30 sampled frames) of the fixtures stored
+                in a folder named after their action, e.g. fixtures/halo/clip.mp4
+
+Run from the repository root:
+    python benchmarks/bench_resolution.py [VIDEO_OR_DIR ...] [--resolutions 960 640 480 320] [--backend onnx]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bench_detectors import PARTS, run, window_labels, xy_error
+from bench_pipeline import FIXTURES_DIR, VIDEO_EXTENSIONS, list_fixtures
+from constants import ACTIONS, MODELS_DIR, VIDEO_FRAMES
+from detection import open_holistic
+from inference import BACKENDS, load_inference_model
+from keypoints import POSE_SIZE
+from video_io import sample_indices
+from video_processing import lstm_input, predict_video
+
+
+def list_videos(paths):
+    """Fixture videos, including those in one level of action folders."""
+    videos = list_fixtures(paths)
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if os.path.isdir(os.path.join(path, name)):
+                    videos += list_fixtures([os.path.join(path, name)])
+    return [video for video in videos if video.lower().endswith(VIDEO_EXTENSIONS)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", default=[FIXTURES_DIR], help="videos or folders of videos")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[960, 640, 480, 320])
+    parser.add_argument("--model", default=os.path.join(ROOT, MODELS_DIR, "model_windowed_seq_5.h5"))
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    args = parser.parse_args()
+
+    videos = list_videos(args.fixtures)
+    if not videos:
+        sys.exit(f"No fixture videos found in {', '.join(args.fixtures)}")
+    model = load_inference_model(args.model, backend=args.backend)
+    labels = {path: os.path.basename(os.path.dirname(path)) for path in videos}
+
+    resolutions = [0] + sorted(set(args.resolutions), reverse=True)  # 0: full resolution
+    keypoints, timings = {}, {}
+    for resolution in resolutions:
+        keypoints[resolution], timings[resolution] = [], []
+        for path in videos:
+            with open_holistic() as detector:
+                video_keypoints, video_timings = run(path, detector, resolution)
+            keypoints[resolution].append(video_keypoints)
+            timings[resolution].append(video_timings)
+        print(f"{resolution or 'full':>5}: {sum(map(len, keypoints[resolution]))} frames", flush=True)
+
+    full = np.concatenate(keypoints[0])
+    reference = [window_labels(model, video_keypoints) for video_keypoints in keypoints[0]]
+    labeled = [i for i, path in enumerate(videos) if labels[path] in ACTIONS]
+
+    print(f"\n{'side':>5} {'p50 ms':>7} {'p95 ms':>7} {'pose err':>9} {'hand pres':>9} {'hand err':>9} "
+          f"{'windows':>8} {'accuracy':>9}")
+    for resolution in resolutions:
+        ms = np.concatenate(timings[resolution])
+        scaled = np.concatenate(keypoints[resolution])
+        pose = xy_error(full[:, :POSE_SIZE], scaled[:, :POSE_SIZE], 4)
+        presence = np.mean([(full[:, columns].any(1) == scaled[:, columns].any(1)).mean() for columns in PARTS.values()])
+        hands = [xy_error(full[:, columns], scaled[:, columns], 3) for columns in PARTS.values()]
+        hands = [error.mean() for error in hands if error is not None]
+
+        agree = total = 0
+        for video_keypoints, expected in zip(keypoints[resolution], reference):
+            predicted = window_labels(model, video_keypoints)
+            agree += int(np.sum(predicted == expected))
+            total += len(expected)
+        correct = 0
+        for i in labeled:
+            sampled = keypoints[resolution][i][sample_indices(len(keypoints[resolution][i]), VIDEO_FRAMES)]
+            correct += predict_video(model, lstm_input(sampled), ACTIONS)[0] == labels[videos[i]]
+
+        print(f"{resolution or 'full':>5} {np.percentile(ms, 50):7.2f} {np.percentile(ms, 95):7.2f} "
+              f"{pose.mean() if pose is not None else float('nan'):9.4f} {presence:9.1%} "
+              f"{np.mean(hands) if hands else float('nan'):9.4f} {agree / total if total else float('nan'):8.1%} "
+              + (f"{correct / len(labeled):9.1%}" if labeled else f"{'-':>9}"))
+
+
+if __name__ == "__main__":
+    main()
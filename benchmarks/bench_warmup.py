@@ -0,0 +1,88 @@
+"""First-prediction latency with and without the background warm-up.
+
+For the model, a freshly loaded copy is timed on its first prediction of
+each shape the app uses, cold and after `inference.warm_up`, against the
+steady-state latency. For the detector, opening one and its first frame
+are timed, cold and when taken from a warmed DetectorReserve.
+Every measurement loads its own model or detector, so none benefits from
+another's warm-up (process-wide caches such as TensorFlow's own set-up are
+paid by the first load, before any timing).
+
+Run from the repository root:
+    python benchmarks/bench_warmup.py [--model ...] [--backend onnx] [--video clip.mp4] [--repeats 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import MODELS_DIR, STRIDE, VIDEO_FRAMES, WINDOW_SIZE
+from detection import DetectorReserve, mediapipe_detection_rgb, open_detector
+from inference import BACKENDS, load_inference_model, warm_up
+
+
+def ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def first_frame(path):
+    if path is None:
+        return np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    cap = cv2.VideoCapture(path)
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        sys.exit(f"Cannot read {path}")
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(ROOT, MODELS_DIR, "model_windowed_seq_5.h5"))
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    parser.add_argument("--video", help="clip whose first frame the detector gets (default: noise)")
+    parser.add_argument("--repeats", type=int, default=20, help="predictions for the steady-state latency")
+    args = parser.parse_args()
+
+    load = lambda: load_inference_model(args.model, backend=args.backend)
+    model = load()  # Process-wide set-up, not timed
+    video_windows = len(range(0, VIDEO_FRAMES - WINDOW_SIZE + 1, STRIDE))
+    batch_sizes = (1, video_windows) if len(model.input_shape) == 2 else (1,)
+
+    print(f"{'model input':<22} {'cold ms':>9} {'warmed ms':>10} {'steady ms':>10}")
+    for batch_size in batch_sizes:
+        x = np.zeros((batch_size,) + tuple(model.input_shape), dtype=np.float32)
+        cold = ms(lambda: load().predict(x))
+        warmed_model = load()
+        warm_up(warmed_model, batch_sizes)
+        warmed = ms(lambda: warmed_model.predict(x))
+        steady = np.median([ms(lambda: warmed_model.predict(x)) for _ in range(args.repeats)])
+        print(f"{str(x.shape):<22} {cold:9.1f} {warmed:10.1f} {steady:10.1f}", flush=True)
+
+    frame = first_frame(args.video)
+    with open_detector():
+        pass  # Process-wide MediaPipe set-up, not timed
+    start = time.perf_counter()
+    with open_detector() as detector:
+        mediapipe_detection_rgb(frame, detector)
+        cold = (time.perf_counter() - start) * 1000
+        steady = np.median([ms(lambda: mediapipe_detection_rgb(frame, detector)) for _ in range(args.repeats)])
+    reserve = DetectorReserve()
+    reserve.warm()
+    start = time.perf_counter()
+    with reserve.open() as detector:
+        mediapipe_detection_rgb(frame, detector)
+        warmed = (time.perf_counter() - start) * 1000
+    print(f"\n{'detector':<22} {'cold ms':>9} {'warmed ms':>10} {'steady ms':>10}")
+    print(f"{'open + first frame':<22} {cold:9.1f} {warmed:10.1f} {steady:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
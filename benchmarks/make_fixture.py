@@ -0,0 +1,54 @@
+"""Render the committed pipeline fixture from images/72631756_9756520.jpg.
+
+The illustration's right-hand figure signs "tolong" (thumb up on the open
+palm). The crop swings and zooms slightly over 3 seconds, so the detector
+tracks a moving signer rather than a still. Holistic finds the figure's pose and
+left hand on every frame, and the right hand on about half of them.
+
+Run from the repository root:
+    python benchmarks/make_fixture.py [--output benchmarks/fixtures/tolong_illustration.mp4]
+"""
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_PATH = os.path.join(ROOT, "images", "72631756_9756520.jpg")
+OUTPUT_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "tolong_illustration.mp4")
+SIGNER = (slice(150, 1900), slice(1000, 1900))  # Rows, columns of the signing figure
+
+
+def render(image, frame_num, frames, size):
+    """One frame: the signer scaled to 90% +- 4% of the height and swayed +- 40 px."""
+    width, height = size
+    phase = 2 * np.pi * frame_num / frames
+    scale = height * (0.9 + 0.04 * np.sin(2 * phase)) / image.shape[0]
+    signer = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    frame = np.full((height, width, 3), 255, dtype=np.uint8)
+    x = int((width - signer.shape[1]) / 2 + 40 * np.sin(phase))
+    y = height - signer.shape[0]
+    frame[y:, x:x + signer.shape[1]] = signer
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--frames", type=int, default=90)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--size", default="640x480")
+    args = parser.parse_args()
+
+    size = tuple(int(side) for side in args.size.split("x"))
+    image = cv2.imread(IMAGE_PATH)[SIGNER]
+    writer = cv2.VideoWriter(args.output, cv2.VideoWriter_fourcc(*"mp4v"), args.fps, size)
+    for frame_num in range(args.frames):
+        writer.write(render(image, frame_num, args.frames, size))
+    writer.release()
+    print(f"Wrote {args.frames} frames to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Load/soak test of the threaded real-time pipeline without a camera.
+
+Runs the same StagePipeline as the real-time page (capture, Holistic,
+keypoints, windowed classification) on a replayed recording, with the display
+side reduced to draining its queue, and prints the performance overlay every
+few seconds.
+
+    python benchmarks/soak_pipeline.py clip.mp4 --duration 3600              # paced like a 30 fps camera, looping
+    python benchmarks/soak_pipeline.py session.bag --fast --backend onnx     # as fast as the stages keep up
+    python benchmarks/soak_pipeline.py webcam                                # any FRAME_SOURCE spec works
+
+Exits 1 if a stage thread died, or if capture, detection or classification
+made no progress for --stall seconds (or at all).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from constants import MODELS_DIR
+from detection import DETECTORS, mediapipe_detection_rgb, open_detector
+from frame_sources import open_source
+from inference import BACKENDS, load_inference_model
+from keypoint_buffer import camera_buffer
+from performance import PerformanceMonitor, format_snapshot
+from stages import StagePipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="video file, .bag recording, 'webcam[:index]' or 'realsense'")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run (recordings loop)")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible instead of at the recorded fps")
+    parser.add_argument("--model", default=os.path.join(ROOT, MODELS_DIR, "model_windowed_seq_5.h5"))
+    parser.add_argument("--backend", default="keras", choices=BACKENDS)
+    parser.add_argument("--detector", default=None, choices=DETECTORS, help="default: constants.DETECTOR")
+    parser.add_argument("--adaptive", action="store_true", help="adaptive detection rate with interpolation")
+    parser.add_argument("--report", type=float, default=5, help="seconds between reports")
+    parser.add_argument("--stall", type=float, default=30, help="fail when a stage makes no progress for this long")
+    args = parser.parse_args()
+
+    model = load_inference_model(args.model, backend=args.backend)
+    predictions = []
+
+    def classify(window):
+        predictions.append(int(np.argmax(model.predict(window[np.newaxis])[0])))
+
+    source = open_source(args.source, realtime=not args.fast, loop=True)
+    monitor = PerformanceMonitor()
+    monitor.enabled = True
+    stages = StagePipeline(source.read, lambda: open_detector(args.detector), mediapipe_detection_rgb,
+                           camera_buffer(), classify,
+                           frame_timestamp=source.timestamp, monitor=monitor, adaptive=args.adaptive,
+                           frame_pool=source.pool)
+
+    def progress():
+        return {"capture": stages.frame_counter, "detection": stages.detected_counter, "classification": len(predictions)}
+
+    healthy = True
+    stages.start()
+    start = time.perf_counter()
+    next_report = start + args.report
+    last_progress = progress()
+    last_change = dict.fromkeys(last_progress, start)
+    try:
+        while time.perf_counter() - start < args.duration:
+            if not stages.alive():
+                stage, error = stages.error or ("a", None)
+                print(f"The {stage} stage died: {error!r}", file=sys.stderr)
+                healthy = False
+                break
+            item = stages.display_queue.get(stages.POLL_TIMEOUT)
+            if item is not None:
+                stages.release_frame(item[0])
+
+            now = time.perf_counter()
+            current = progress()
+            stalled = []
+            for stage, count in current.items():
+                if count != last_progress[stage]:
+                    last_change[stage] = now
+                elif now - last_change[stage] > args.stall:
+                    stalled.append(stage)
+            last_progress = current
+            if stalled:
+                print(f"No {', '.join(stalled)} progress for {args.stall:.0f} s", file=sys.stderr)
+                healthy = False
+                break
+
+            if now >= next_report:
+                print(f"[{time.perf_counter() - start:7.0f} s] {stages.frame_counter} frames, {stages.detected_counter} detected, "
+                      f"{len(predictions)} predictions, {source.pool.in_use()}/{len(source.pool)} frame buffers in use, "
+                      f"{source.pool.allocated} allocated outside the pool")
+                snapshot = monitor.snapshot(stages.stats())
+                if args.adaptive:
+                    snapshot["detect_every"] = stages.rate.every
+                print(format_snapshot(snapshot), flush=True)
+                next_report += args.report
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stages.stop()
+        source.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{stages.frame_counter} frames in {elapsed:.0f} s ({stages.frame_counter / elapsed:.1f} fps captured, "
+          f"{stages.detected_counter / elapsed:.1f} fps detected, {stages.interpolated_counter} interpolated), "
+          f"{len(predictions)} predictions")
+    for stage, count in progress().items():
+        if not count:
+            print(f"No {stage} output at all", file=sys.stderr)
+            healthy = False
+    sys.exit(0 if healthy else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import time
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QThread, Signal
+
+from detection import mediapipe_detection_rgb, open_detector
+from frame_sources import FramePool
+from landmark_overlay import draw_keypoints
+from performance import REPORT_INTERVAL, PerformanceMonitor
+from stages import FrameMailbox, StagePipeline
+
+
+class CameraThread(QThread):
+    """Real-time page: frames from a FrameSource through the capture/detection/classification stages.
+
+    source      FrameSource (see frame_sources.py): camera, webcam or a replayed recording
+    sequence    KeypointRingBuffer shaped for the model (window size, stride, interval)
+    predict     window (window_size, 258) -> class probabilities
+    adaptive    detect every k-th frame under load and interpolate the rest (see StagePipeline)
+    detectors   optional DetectorReserve to take a warmed-up detector from
+
+    Frames for the preview aren't sent as signals: they are scaled to
+    `display_size` here, off the GUI thread, get the landmark overlay if
+    `show_landmarks` is set, and are left in `mailbox`, which the GUI polls
+    at the display refresh rate. The GUI hands every frame it took back with
+    `release_frame` once painted, so its buffer can be reused.
+    """
+    performance_updated = Signal(dict)  # PerformanceMonitor snapshot, sent while the overlay is shown
+    prediction_updated = Signal(str)
+    indicator_updated = Signal(str)  # Signal for indicator (red/green)
+    failed = Signal(str)  # A stage raised (e.g. the camera was unplugged); the thread has stopped
+
+    def __init__(self, source, sequence, predict, actions, threshold=0.75, adaptive=False, detectors=None):
+        super().__init__()
+        self.running = False
+        self.sentence = []
+        self.threshold = threshold
+        self.processing = False  # Indicator flag
+
+        self.source = source
+        self.sequence = sequence
+        self.predict = predict
+        self.actions = actions
+        self.mailbox = FrameMailbox(on_replace=lambda item: self.release_frame(item[0]))  # Newest (RGB frame, capture time) for the preview
+        self.display_size = None  # (width, height) the preview shows, set by the GUI
+        self.display_pool = FramePool()  # Buffers of the scaled preview frames
+        self.show_landmarks = False  # Draw the newest detected skeletons on the preview
+
+        # Capture, detection and classification run as separate stages;
+        # while the model is busy only the newest window is kept for it
+        self.monitor = PerformanceMonitor()  # Only collects while the performance overlay is visible
+        # A warmed-up detector from `detectors` if one is ready, so the first frames aren't slower
+        stage_detector = detectors.open if detectors else open_detector
+        self.stages = StagePipeline(source.read, stage_detector, mediapipe_detection_rgb,
+                                    self.sequence, self.classify,
+                                    frame_timestamp=source.timestamp, monitor=self.monitor, adaptive=adaptive,
+                                    frame_pool=source.pool)
+
+    def classify(self, window):
+        """ Runs in the classification stage for every full window. """
+        self.processing = True  # Start processing
+        self.indicator_updated.emit("red")  # Set indicator to red
+
+        prediction = self.predict(window)
+        predicted_action = self.actions[np.argmax(prediction)]
+
+        if prediction[np.argmax(prediction)] > self.threshold:
+            if len(self.sentence) == 0 or predicted_action != self.sentence[-1]:
+                self.sentence.append(predicted_action)
+            self.sentence = self.sentence[-5:]
+
+        self.prediction_updated.emit(' '.join(self.sentence))
+
+        self.processing = False  # Prediction finished
+        self.indicator_updated.emit("green")  # Set indicator to green
+
+    def queue_stats(self):
+        """ Depth and drop counters of the stage queues. """
+        return self.stages.stats()
+
+    def performance(self):
+        """ Rolling stage timings, fps, detection rate and dropped frames for the overlay. """
+        snapshot = self.monitor.snapshot(self.stages.stats())
+        snapshot["coalesced"] = self.mailbox.coalesced
+        if self.stages.adaptive:
+            snapshot["detect_every"] = self.stages.rate.every
+        return snapshot
+
+    def failure(self):
+        """ Message for the page about the stage that stopped. """
+        if self.stages.error is None:
+            return "Camera stopped"
+        stage, error = self.stages.error
+        return f"Camera stopped, {stage} failed: {type(error).__name__}: {error}"
+
+    def release_frame(self, frame):
+        """ Give a preview frame back to its pool: the source's, or `display_pool` for scaled ones. """
+        self.stages.release_frame(frame)
+        self.display_pool.release(frame)
+
+    def display_frame(self, frame):
+        """ Frame for the preview: resized to `display_size` and with the landmark overlay, in a pooled buffer.
+
+        The captured frame itself is also the detector's input, so it's only
+        returned as is when it already fits and nothing is drawn on it.
+        """
+        width, height = self.display_size or (frame.shape[1], frame.shape[0])
+        keypoints = self.stages.latest_keypoints if self.show_landmarks else None
+        if keypoints is None and (width, height) == (frame.shape[1], frame.shape[0]):
+            return frame
+        out = self.display_pool.acquire((height, width, frame.shape[2]))
+        if (width, height) == (frame.shape[1], frame.shape[0]):
+            np.copyto(out, frame)
+        else:
+            cv2.resize(frame, (width, height), dst=out, interpolation=cv2.INTER_AREA)
+        if keypoints is not None:
+            timing = self.monitor.enabled
+            if timing:
+                start = time.perf_counter()
+            draw_keypoints(out, keypoints)
+            if timing:
+                self.monitor.add("overlay", time.perf_counter() - start)
+        return out
+
+    def run(self):
+        self.running = True
+        self.stages.start()
+        next_report = 0.0
+
+        # Display stage: leave the newest captured frame for the GUI, until a replayed recording ends
+        while self.running and not self.source.finished:
+            if not self.stages.alive():
+                self.failed.emit(self.failure())
+                break
+            item = self.stages.display_queue.get(self.stages.POLL_TIMEOUT)
+            if item is not None:
+                frame, captured_at = item
+                display = self.display_frame(frame)
+                if display is not frame:
+                    self.stages.release_frame(frame)
+                self.mailbox.post((display, captured_at))
+            if self.monitor.enabled and time.perf_counter() >= next_report:
+                self.performance_updated.emit(self.performance())
+                next_report = time.perf_counter() + REPORT_INTERVAL
+
+        self.stages.stop()
+        self.mailbox.clear()
+
+    def stop(self):
+        self.running = False
+        self.quit()
+        self.wait()
+        self.source.close()
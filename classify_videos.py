@@ -0,0 +1,119 @@
+"""Classify a directory (or a manifest) of sign videos without the GUI.
+
+    python classify_videos.py VIDEOS_DIR_OR_MANIFEST [--model PATH] [--backend onnx] [--workers 4] [--output results.jsonl]
+
+A manifest is a text file with one video path per line (relative paths are
+resolved against the manifest's folder). Videos are classified concurrently,
+one per worker process, and every result is written as a JSON line as soon as
+it is ready: label, averaged probabilities, per-window scores and timings.
+Throughput is printed to stderr at the end. Needs neither a display nor a
+camera: PySide6 and pyrealsense2 are never imported.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from constants import ACTIONS, MODELS_DIR, VIDEO_FRAMES
+from inference import BACKENDS, load_inference_model
+from keypoint_cache import default_cache
+from video_io import open_video
+from video_processing import model_input, predict_video, video_keypoints
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')  # Same as the upload dialog
+DEFAULT_MODEL = os.path.join(MODELS_DIR, 'model_windowed_seq_5.h5')
+
+_model = None  # Loaded once per worker process
+
+
+def _init_worker(model_path, backend):
+    global _model
+    _model = load_inference_model(model_path, backend=backend)
+
+
+def list_videos(source):
+    """Video paths of a directory (recursively, sorted) or of a manifest file."""
+    if os.path.isdir(source):
+        return sorted(os.path.join(folder, name) for folder, _, names in os.walk(source)
+                      for name in names if name.lower().endswith(VIDEO_EXTENSIONS))
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith('#')]
+
+
+def classify_video(path, target_frame_count=VIDEO_FRAMES, cache=True):
+    """One JSON-serialisable result; errors are reported in the result instead of raised."""
+    result = {'video': path}
+    hits = default_cache().hits
+    try:
+        start = time.perf_counter()
+        video = open_video(path)
+        frames_data = video_keypoints(video, target_frame_count, workers=1, cache=cache)
+        extracted = time.perf_counter()
+        label, avg_prediction, predictions = predict_video(_model, model_input(frames_data, _model.input_shape))
+        done = time.perf_counter()
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update({
+        'label': str(label),
+        'avg_prediction': None if avg_prediction is None else dict(zip(ACTIONS, map(float, avg_prediction))),
+        'window_scores': None if predictions is None else predictions.round(6).tolist(),
+        'frames': len(frames_data),
+        'video_frames': len(video),
+        'cached_frames': default_cache().hits - hits,
+        'timings': {'extract_s': extracted - start, 'predict_s': done - extracted, 'total_s': done - start},
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help='folder of videos or manifest file')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--backend', default='keras', choices=BACKENDS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='videos classified in parallel')
+    parser.add_argument('--frames', type=int, default=VIDEO_FRAMES, help='frames sampled per video')
+    parser.add_argument('--output', help='JSON lines file (default: stdout)')
+    parser.add_argument('--no-cache', action='store_true', help='always run the detector, ignoring the keypoint cache')
+    args = parser.parse_args()
+
+    videos = list_videos(args.source)
+    if not videos:
+        sys.exit(f"No videos found in {args.source}")
+
+    # Load it here first: a model the workers can't load would only surface as a BrokenProcessPool
+    try:
+        _init_worker(args.model, args.backend)
+    except Exception as e:
+        sys.exit(f"Cannot load {args.model} with the {args.backend} backend: {type(e).__name__}: {e}")
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+    frames = failed = cached = 0
+    # spawn: every worker starts clean and loads its own model and detector
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(videos)), initializer=_init_worker,
+                             initargs=(args.model, args.backend), mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(classify_video, path, args.frames, not args.no_cache) for path in videos]
+        for future in as_completed(futures):
+            result = future.result()
+            frames += result.get('frames', 0)
+            failed += 'error' in result
+            cached += result.get('cached_frames', 0)
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+    elapsed = time.perf_counter() - start
+    if out is not sys.stdout:
+        out.close()
+
+    print(f"{len(videos)} videos ({failed} failed), {frames} frames ({cached} from the keypoint cache) in {elapsed:.1f} s: "
+          f"{len(videos) / elapsed:.2f} videos/s, {frames / elapsed:.1f} frames/s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
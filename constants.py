@@ -0,0 +1,15 @@
+# Shared by the app, the preprocessing scripts and the benchmarks
+
+ACTIONS = ['halo', 'apa kabar', 'aku', 'kamu', 'maaf', 'tolong', 'ya', 'tidak', 'suka', 'makanan',
+           'selamat pagi', 'selamat siang', 'selamat sore', 'selamat malam', 'sampai jumpa lagi',
+           'perkenalkan', 'terima kasih', 'sama-sama', 'mau', 'tidak mau']
+
+MODELS_DIR = 'Preprocessing/Models'
+
+WINDOW_SIZE = 10  # Frames per window of the windowed LSTM
+STRIDE = 5  # Sliding window step
+PREDICTION_INTERVAL = 30  # Camera page: frames between predictions
+VIDEO_FRAMES = 30  # Frames sampled from an uploaded video
+
+DETECTOR = "holistic"  # "holistic", or "tasks" for the MediaPipe Tasks pose + hand landmarkers (no face mesh)
+DETECTION_RESOLUTION = None  # Longest image side the detector sees, e.g. 640 for HD uploads (None = as captured)
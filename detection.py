@@ -0,0 +1,284 @@
+import os
+import threading
+import time
+import urllib.request
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from constants import DETECTION_RESOLUTION, DETECTOR, MODELS_DIR
+from keypoints import HAND_SIZE, N_KEYPOINTS, POSE_LANDMARKS, POSE_SIZE
+
+mp_holistic = mp.solutions.holistic
+
+DETECTORS = ("holistic", "tasks")
+HOLISTIC_OPTIONS = {"min_detection_confidence": 0.5, "min_tracking_confidence": 0.5, "model_complexity": 1}
+TASKS_OPTIONS = {"pose_model": "lite", "min_detection_confidence": 0.5, "min_presence_confidence": 0.5,
+                 "min_tracking_confidence": 0.5}
+TASKS_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), MODELS_DIR, "mediapipe")
+TASKS_MODEL_URLS = {
+    "pose_landmarker_lite": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task",
+    "pose_landmarker_full": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task",
+    "pose_landmarker_heavy": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_heavy/float16/latest/pose_landmarker_heavy.task",
+    "hand_landmarker": "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task",
+}
+LEFT_WRIST, RIGHT_WRIST = 15, 16  # Pose landmarks, named after the signer's side like Holistic's hands
+
+
+def open_holistic(**options):
+    """Holistic detector with the settings the app and the Dataset were recorded with."""
+    return mp_holistic.Holistic(**{**HOLISTIC_OPTIONS, **options})
+
+
+def landmarker_model(name):
+    """Path of a MediaPipe Tasks model bundle, downloaded to Models/mediapipe/ on first use."""
+    path = os.path.join(TASKS_MODELS_DIR, f"{name}.task")
+    if not os.path.exists(path):
+        os.makedirs(TASKS_MODELS_DIR, exist_ok=True)
+        urllib.request.urlretrieve(TASKS_MODEL_URLS[name], path + ".tmp")
+        os.replace(path + ".tmp", path)
+    return path
+
+
+class LandmarkResults:
+    """Result of TasksLandmarker in the 258-keypoint layout of `extract_keypoints`.
+
+    `extract_keypoints_into` copies `keypoints` directly; the Holistic-style
+    `pose_landmarks`, `left_hand_landmarks` and `right_hand_landmarks` are
+    only built on access (e.g. for mp_drawing).
+    """
+
+    def __init__(self, keypoints):
+        self.keypoints = keypoints
+
+    def _landmark_list(self, values, n_values):
+        from mediapipe.framework.formats import landmark_pb2
+        if not values.any():
+            return None
+        return landmark_pb2.NormalizedLandmarkList(landmark=[
+            landmark_pb2.NormalizedLandmark(**dict(zip(("x", "y", "z", "visibility"), map(float, row))))
+            for row in values.reshape(-1, n_values)])
+
+    @property
+    def pose_landmarks(self):
+        return self._landmark_list(self.keypoints[:POSE_SIZE], 4)
+
+    @property
+    def left_hand_landmarks(self):
+        return self._landmark_list(self.keypoints[POSE_SIZE:POSE_SIZE + HAND_SIZE], 3)
+
+    @property
+    def right_hand_landmarks(self):
+        return self._landmark_list(self.keypoints[POSE_SIZE + HAND_SIZE:], 3)
+
+
+def combine_landmarks(pose_result, hand_result, out=None):
+    """(258,) keypoints from a PoseLandmarkerResult and a HandLandmarkerResult.
+
+    Hands are matched to the nearest pose wrist, so left/right means the
+    signer's side as with Holistic. Without a pose, the landmarker's
+    handedness is used; it assumes a mirrored (selfie) image and is flipped
+    for the unmirrored camera and video frames.
+    """
+    out = np.zeros(N_KEYPOINTS, dtype=np.float32) if out is None else out
+    out[:] = 0
+    pose = None
+    if pose_result is not None and pose_result.pose_landmarks:
+        pose = np.array([(lm.x, lm.y, lm.z, lm.visibility or 0.0) for lm in pose_result.pose_landmarks[0]],
+                        dtype=np.float32)
+        out[:POSE_SIZE] = pose[:POSE_LANDMARKS].ravel()
+    if hand_result is None or not hand_result.hand_landmarks:
+        return out
+
+    hands = [np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+             for landmarks in hand_result.hand_landmarks]
+    if pose is not None:
+        wrists = pose[[LEFT_WRIST, RIGHT_WRIST], :2]
+        distances = np.array([np.linalg.norm(wrists - hand[0, :2], axis=1) for hand in hands])  # (hands, 2)
+        sides = {}
+        # Closest (hand, wrist) pair first, so two hands never claim the same side
+        for flat in np.argsort(distances, axis=None):
+            hand, side = divmod(int(flat), 2)
+            if hand not in sides and side not in sides.values():
+                sides[hand] = side
+    else:
+        sides = {i: 0 if categories[0].category_name == "Right" else 1
+                 for i, categories in enumerate(hand_result.handedness)}
+    for hand, side in sides.items():
+        start = POSE_SIZE + side * HAND_SIZE
+        out[start:start + HAND_SIZE] = hands[hand].ravel()
+    return out
+
+
+class TasksLandmarker:
+    """MediaPipe Tasks pose and hand landmarkers used in place of Holistic.
+
+    Holistic also runs the 468-point face mesh that `extract_keypoints`
+    throws away; these two landmarkers produce only the pose and hands, in the
+    same 258-keypoint layout. Like Holistic, `process(rgb_image)` returns an
+    object `extract_keypoints_into` understands.
+
+    running_mode "video"        synchronous, results of the frame passed in
+                 "live_stream"  pose and hands run asynchronously in parallel;
+                                `process` returns the newest completed result,
+                                which lags the frame passed in
+    """
+
+    def __init__(self, running_mode="video", pose_model="lite", min_detection_confidence=0.5,
+                 min_presence_confidence=0.5, min_tracking_confidence=0.5):
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self.running_mode = running_mode
+        live = running_mode == "live_stream"
+        mode = vision.RunningMode.LIVE_STREAM if live else vision.RunningMode.VIDEO
+        self.pose = vision.PoseLandmarker.create_from_options(vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=landmarker_model(f"pose_landmarker_{pose_model}")),
+            running_mode=mode, num_poses=1, min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_presence_confidence, min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._pose_done if live else None))
+        self.hands = vision.HandLandmarker.create_from_options(vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=landmarker_model("hand_landmarker")),
+            running_mode=mode, num_hands=2, min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence, min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._hands_done if live else None))
+
+        self._timestamp = -1  # ms; MediaPipe requires strictly increasing timestamps
+        self._lock = threading.Lock()
+        self._pending = {}  # timestamp -> [pose result, hand result] (live stream)
+        self._latest = LandmarkResults(np.zeros(N_KEYPOINTS, dtype=np.float32))
+        self.completed = 0  # Frames with both results delivered (live stream)
+
+    def process(self, image, timestamp_ms=None):
+        """Landmarks of an RGB image; `timestamp_ms` defaults to the monotonic clock."""
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        self._timestamp = max(int(timestamp_ms), self._timestamp + 1)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(image))
+
+        if self.running_mode == "live_stream":
+            self.pose.detect_async(mp_image, self._timestamp)
+            self.hands.detect_async(mp_image, self._timestamp)
+            return self._latest
+        return LandmarkResults(combine_landmarks(self.pose.detect_for_video(mp_image, self._timestamp),
+                                                 self.hands.detect_for_video(mp_image, self._timestamp)))
+
+    def _done(self, slot, result, timestamp_ms):
+        with self._lock:
+            pending = self._pending.setdefault(timestamp_ms, [None, None])
+            pending[slot] = result
+            if pending[0] is None or pending[1] is None:
+                return
+            self._latest = LandmarkResults(combine_landmarks(*pending))
+            self.completed += 1
+            # Results of older frames that lost a race are of no use any more
+            for timestamp in [timestamp for timestamp in self._pending if timestamp <= timestamp_ms]:
+                del self._pending[timestamp]
+
+    def _pose_done(self, result, output_image, timestamp_ms):
+        self._done(0, result, timestamp_ms)
+
+    def _hands_done(self, result, output_image, timestamp_ms):
+        self._done(1, result, timestamp_ms)
+
+    def close(self):
+        self.pose.close()
+        self.hands.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_detector(detector=None, running_mode="video", **options):
+    """The configured landmark detector (constants.DETECTOR): Holistic or the Tasks landmarkers."""
+    detector = detector or DETECTOR
+    if detector == "holistic":
+        return open_holistic(**options)
+    if detector == "tasks":
+        return TasksLandmarker(running_mode, **{**TASKS_OPTIONS, **options})
+    raise ValueError(f"Unknown detector {detector!r}, expected one of {DETECTORS}")
+
+
+def warm_up_detector(detector, shape=(480, 640, 3)):
+    """Run a blank RGB frame through `detector`, so its graphs are loaded before the first real frame."""
+    blank = np.zeros(shape, dtype=np.uint8)
+    blank.flags.writeable = False
+    detector.process(blank)
+
+
+class DetectorReserve:
+    """A detector opened and warmed up ahead of time, for the next camera start.
+
+    `warm()`, from a background thread, opens one and runs a blank frame
+    through it. `open()` is StagePipeline's `open_detector`: it hands the warm
+    detector over (the pipeline closes it when the camera stops), or opens a
+    cold one if none is ready.
+    """
+
+    def __init__(self, frame_shape=(480, 640, 3), **options):
+        self.frame_shape = frame_shape
+        self.options = options
+        self._detector = None
+        self._lock = threading.Lock()
+
+    def warm(self):
+        detector = open_detector(**self.options)
+        warm_up_detector(detector, self.frame_shape)
+        with self._lock:
+            detector, self._detector = self._detector, detector
+        if detector is not None:
+            detector.close()  # Replaced by the new one
+
+    def open(self):
+        with self._lock:
+            detector, self._detector = self._detector, None
+        return detector if detector is not None else open_detector(**self.options)
+
+
+def detection_image(image, resolution=None):
+    """`image` downscaled (aspect ratio kept) so its longest side is at most `resolution` pixels.
+
+    Landmarks are normalised to the image size, so they come out in the same
+    coordinates for the full-resolution frame.
+    """
+    resolution = DETECTION_RESOLUTION if resolution is None else resolution
+    height, width = image.shape[:2]
+    scale = resolution / max(height, width) if resolution else 1
+    if scale >= 1:
+        return image
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def mediapipe_detection(image, model, resolution=None, rgb=False):
+    """Landmarks of a BGR frame (RGB with `rgb`), detected at the inference resolution (constants.DETECTION_RESOLUTION).
+
+    An RGB frame at full resolution goes to the detector as a read-only view,
+    without any copy or conversion. Returns the full-resolution frame itself,
+    for display and overlays, with the results.
+    """
+    small = detection_image(image, resolution)
+    if rgb:
+        small = small.view()  # Read-only flag on the view only: the display still shares the frame
+    else:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+    small.flags.writeable = False
+    results = model.process(small)
+    return image, results
+
+
+def mediapipe_detection_rgb(image, model):
+    """`mediapipe_detection` for the RGB frames of frame_sources."""
+    return mediapipe_detection(image, model, rgb=True)
+
+
+def detector_config(detector=None, **options):
+    """Everything that changes the extracted keypoints, e.g. to key cached results."""
+    detector = detector or DETECTOR
+    defaults = HOLISTIC_OPTIONS if detector == "holistic" else TASKS_OPTIONS
+    if DETECTION_RESOLUTION:
+        defaults = {**defaults, "resolution": DETECTION_RESOLUTION}
+    return {"detector": detector, "mediapipe": mp.__version__, **defaults, **options}
@@ -0,0 +1,294 @@
+"""Frame sources for the real-time page: RealSense camera, webcam, video file or RealSense .bag recording.
+
+Every source has the same interface, the one StagePipeline expects:
+
+    read()       -> next RGB frame (np.ndarray), or None if none is available (yet)
+    timestamp()  -> wall-clock capture time of the frame `read` just returned
+    finished     -> True once a recording has played to its end
+    close()
+
+Frames are written into reusable buffers from a FramePool instead of a new
+array per frame; whoever reads a frame owns it and releases it to the pool
+once done (StagePipeline does). They are in RGB: the order MediaPipe and QImage.Format_RGB888 take, so
+the pipeline never converts colors again. The RealSense streams RGB itself;
+OpenCV decodes BGR, swapped once in place. Recordings are replayed either paced at their own frame rate
+(`realtime=True`, as a camera would deliver them) or as fast as they decode,
+optionally looping forever for soak tests.
+
+    open_source("realsense")         RealSense color stream
+    open_source("webcam")            V4L webcam 0 ("webcam:1" for another device)
+    open_source("clip.mp4")          video file
+    open_source("session.bag")       RealSense recording
+"""
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+FRAME_WIDTH = 640
+FRAME_HEIGHT = 480
+FRAME_RATE = 30
+POOL_SIZE = 12  # Recycled buffers per source: every frame the stage queues, stages, mailbox and GUI can hold at once
+BAG_TIMEOUT_MS = 1000  # Wait for a .bag frame before checking whether the playback ended
+
+
+class FramePool:
+    """Reusable frame buffers with explicit ownership.
+
+    `acquire` hands out a free buffer held once, by the caller. Every further
+    holder (a queue, a stage) calls `retain`, and every holder calls `release`
+    when done with it; the last release makes the buffer free again, so a frame
+    is never overwritten while it is still in use. At most `size` buffers are
+    recycled: while all of them are held, `acquire` returns a new array that
+    isn't (counted in `allocated`), so memory stays bounded whatever a consumer
+    holds on to. `retain` and `release` ignore arrays that aren't pooled.
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self.allocated = 0  # Arrays handed out outside the pool because every buffer was held
+        self._buffers = []
+        self._holders = {}  # id(buffer) -> number of holders
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.uint8):
+        with self._lock:
+            for buffer in self._buffers:
+                if not self._holders[id(buffer)] and buffer.shape == shape and buffer.dtype == dtype:
+                    self._holders[id(buffer)] = 1
+                    return buffer
+            # Free buffers left are of another shape (e.g. the resolution changed): make room
+            for buffer in [buffer for buffer in self._buffers if not self._holders[id(buffer)]]:
+                self._buffers.remove(buffer)
+                del self._holders[id(buffer)]
+            buffer = np.empty(shape, dtype=dtype)
+            if len(self._buffers) < self.size:
+                self._buffers.append(buffer)
+                self._holders[id(buffer)] = 1
+            else:
+                self.allocated += 1
+            return buffer
+
+    def retain(self, buffer):
+        with self._lock:
+            if id(buffer) in self._holders:
+                self._holders[id(buffer)] += 1
+
+    def release(self, buffer):
+        with self._lock:
+            if self._holders.get(id(buffer)):
+                self._holders[id(buffer)] -= 1
+
+    def in_use(self):
+        """Pooled buffers currently held."""
+        with self._lock:
+            return sum(1 for holders in self._holders.values() if holders)
+
+    def __len__(self):
+        return len(self._buffers)
+
+
+class FrameSource:
+    """Base class: pacing, timestamps and the buffer pool. Subclasses implement `_read()`."""
+
+    _timestamp_read = False  # Set by sources that take the capture time from the device
+
+    def __init__(self, fps=FRAME_RATE, realtime=True, pool_size=POOL_SIZE):
+        self.fps = fps
+        self.realtime = realtime
+        self.pool = FramePool(pool_size)
+        self.finished = False
+        self.frames = 0
+        self._timestamp = 0.0
+        self._due = None  # perf_counter time the next paced frame is due
+
+    def read(self):
+        if self.finished:
+            return None
+        if self.realtime:
+            self._pace()
+        frame = self._read()
+        if frame is None:
+            return None
+        self.frames += 1
+        if not self._timestamp_read:
+            self._timestamp = time.time()
+        return frame
+
+    def _pace(self):
+        period = 1 / self.fps if self.fps else 0
+        now = time.perf_counter()
+        if self._due is None or now - self._due > period:
+            self._due = now  # First frame, or fell behind: don't try to catch up
+        elif self._due > now:
+            time.sleep(self._due - now)
+        self._due += period
+
+    def timestamp(self):
+        return self._timestamp
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VideoCaptureSource(FrameSource):
+    """OpenCV capture decoding straight into pooled buffers, swapped to RGB in place."""
+
+    def __init__(self, cap, fps, realtime, pool_size=POOL_SIZE):
+        super().__init__(fps, realtime, pool_size)
+        self.cap = cap
+        self.shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3)
+
+    def _read(self):
+        buffer = self.pool.acquire(self.shape)
+        ret, frame = self.cap.read(buffer)
+        if not ret or frame is not buffer:
+            self.pool.release(buffer)
+        if not ret:
+            return self._end()
+        if frame is not buffer:
+            # The decoder changed resolution: use its frame and size the next buffers to match
+            self.shape = frame.shape
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+    def _end(self):
+        return None
+
+    def close(self):
+        if self.cap.isOpened():
+            self.cap.release()
+
+
+class WebcamSource(VideoCaptureSource):
+    """Webcam through V4L2 on Linux (the platform default elsewhere); paced by the camera itself."""
+
+    def __init__(self, device=0, width=FRAME_WIDTH, height=FRAME_HEIGHT, fps=FRAME_RATE, pool_size=POOL_SIZE):
+        api = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        cap = cv2.VideoCapture(device, api)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open webcam {device}")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_FPS, fps)
+        super().__init__(cap, fps, realtime=False, pool_size=pool_size)
+
+
+class VideoFileSource(VideoCaptureSource):
+    """A recorded video replayed as a camera feed."""
+
+    def __init__(self, path, realtime=True, loop=False, pool_size=POOL_SIZE):
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video {path}")
+        self.path = path
+        self.loop = loop
+        super().__init__(cap, cap.get(cv2.CAP_PROP_FPS) or FRAME_RATE, realtime, pool_size)
+
+    def _end(self):
+        if self.loop and self.frames:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            buffer = self.pool.acquire(self.shape)
+            ret, frame = self.cap.read(buffer)
+            if not ret or frame is not buffer:
+                self.pool.release(buffer)
+            if ret:
+                return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        self.finished = True
+        return None
+
+
+class RealSenseSource(FrameSource):
+    """Color stream of a RealSense camera, stamped with the device clock when it is the system clock."""
+
+    _timestamp_read = True
+
+    def __init__(self, width=FRAME_WIDTH, height=FRAME_HEIGHT, fps=FRAME_RATE, pool_size=POOL_SIZE):
+        import pyrealsense2 as rs
+        self.rs = rs
+        super().__init__(fps, realtime=False, pool_size=pool_size)
+        self.pipeline = rs.pipeline()
+        config = rs.config()
+        self._configure(config, width, height, fps)
+        self.profile = self.pipeline.start(config)
+
+    def _configure(self, config, width, height, fps):
+        config.enable_stream(self.rs.stream.color, width, height, self.rs.format.rgb8, fps)
+
+    def _wait(self):
+        return self.pipeline.wait_for_frames()
+
+    def _read(self):
+        frames = self._wait()
+        color_frame = frames.get_color_frame() if frames else None
+        if not color_frame:
+            return None
+
+        # Hardware timestamps are only comparable to the wall clock in the global/system time domains
+        domain = color_frame.get_frame_timestamp_domain()
+        if domain in (self.rs.timestamp_domain.global_time, self.rs.timestamp_domain.system_time):
+            self._timestamp = color_frame.get_timestamp() / 1000
+        else:
+            self._timestamp = time.time()
+
+        # Copy so the RealSense frame goes back to its pool while the stages hold the image
+        data = np.asanyarray(color_frame.get_data())
+        buffer = self.pool.acquire(data.shape)
+        if color_frame.get_profile().format() == self.rs.format.bgr8:  # e.g. a .bag recorded in BGR
+            cv2.cvtColor(data, cv2.COLOR_BGR2RGB, dst=buffer)
+        else:
+            np.copyto(buffer, data)
+        return buffer
+
+    def close(self):
+        self.pipeline.stop()
+
+
+class RealSenseBagSource(RealSenseSource):
+    """A RealSense .bag recording played back through the same pipeline as the camera."""
+
+    _timestamp_read = False  # Recorded timestamps are in the past: stamp frames when they are replayed
+
+    def __init__(self, path, realtime=True, loop=False, pool_size=POOL_SIZE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No RealSense recording at {path}")
+        self.path = path
+        self.loop = loop
+        super().__init__(pool_size=pool_size)
+        # librealsense paces the playback itself; without real time it delivers frames as fast as they're read
+        self.realtime = False
+        self.playback = self.profile.get_device().as_playback()
+        self.playback.set_real_time(realtime)
+
+    def _configure(self, config, width, height, fps):
+        config.enable_device_from_file(self.path, repeat_playback=self.loop)
+        config.enable_stream(self.rs.stream.color)  # Whatever resolution and format were recorded
+
+    def _wait(self):
+        ok, frames = self.pipeline.try_wait_for_frames(BAG_TIMEOUT_MS)
+        if not ok and self.playback.current_status() == self.rs.playback_status.stopped:
+            self.finished = True
+        return frames if ok else None
+
+
+def open_source(spec, realtime=True, loop=False, pool_size=POOL_SIZE):
+    """The frame source described by `spec`: "realsense", "webcam[:index]", or the path of a video or .bag file.
+
+    `realtime` and `loop` only apply to recordings.
+    """
+    if spec == "realsense":
+        return RealSenseSource(pool_size=pool_size)
+    if spec == "webcam" or spec.startswith("webcam:"):
+        device = spec.partition(":")[2]
+        return WebcamSource(int(device) if device else 0, pool_size=pool_size)
+    if spec.lower().endswith(".bag"):
+        return RealSenseBagSource(spec, realtime, loop, pool_size)
+    return VideoFileSource(spec, realtime, loop, pool_size)
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+
+INFERENCE_MODES = ("predict", "call", "compiled")
+BACKENDS = ("keras", "tflite", "onnx")
+EXPORT_FORMATS = {"tflite": ".tflite", "onnx": ".onnx"}
+QUANTIZATIONS = ("float16", "dynamic", "int8")  # TFLite post-training variants from Preprocessing/quantize_models.py
+
+
+class CompiledModel:
+    """Low-overhead inference wrapper around a loaded Keras model.
+
+    `predict` keeps the Keras call signature used in the UI functions modules
+    (array in, array of class probabilities out) but skips the data adapter and
+    callback machinery Keras builds on every `model.predict`:
+
+    - "predict":  plain `model.predict`, for comparison
+    - "call":     direct `model(x, training=False)`
+    - "compiled": tf.function traced once per input signature, a fixed (1, ...)
+                  signature for single windows and a (None, ...) one for batches,
+                  optionally XLA-compiled with `jit_compile=True`
+    """
+
+    def __init__(self, model, mode="compiled", jit_compile=False):
+        import tensorflow as tf
+
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode {mode!r}, expected one of {INFERENCE_MODES}")
+        self.model = model
+        self.mode = mode
+        self.jit_compile = jit_compile
+        self.input_shape = tuple(model.input_shape[1:])  # (10, 258) for the LSTM, (30, 258, 1) for the CNN
+
+        def forward(x):
+            return model(x, training=False)
+
+        self._single = tf.function(forward, jit_compile=jit_compile,
+                                   input_signature=[tf.TensorSpec((1,) + self.input_shape, tf.float32)])
+        self._batch = tf.function(forward, jit_compile=jit_compile,
+                                  input_signature=[tf.TensorSpec((None,) + self.input_shape, tf.float32)])
+
+    def predict(self, x, **kwargs):
+        x = np.asarray(x, dtype=np.float32)
+        if self.mode == "predict":
+            return self.model.predict(x, **kwargs)
+        if self.mode == "call":
+            return self.model(x, training=False).numpy()
+        fn = self._single if x.shape[0] == 1 else self._batch
+        return fn(x).numpy()
+
+
+class TFLiteModel:
+    """Runs an exported `.tflite` model with the TFLite interpreter (tflite_runtime if installed)."""
+
+    def __init__(self, path, num_threads=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(self._input["shape"][1:])
+        self._batch_size = self._input["shape"][0]
+
+    def _invoke(self, x):
+        self.interpreter.set_tensor(self._input["index"], x)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output["index"])
+
+    def predict(self, x, **kwargs):
+        x = np.asarray(x, dtype=np.float32)
+        if x.shape[0] == self._batch_size:
+            return self._invoke(x)
+        # The graph is converted with a fixed batch of 1 (fused LSTM kernels), so batches run window by window
+        return np.concatenate([self._invoke(x[i:i + self._batch_size]) for i in range(0, len(x), self._batch_size)])
+
+
+class OnnxModel:
+    """Runs an exported `.onnx` model with ONNX Runtime on CPU."""
+
+    def __init__(self, path, num_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self.input_shape = tuple(model_input.shape[1:])
+
+    def predict(self, x, **kwargs):
+        x = np.asarray(x, dtype=np.float32)
+        return self.session.run(None, {self._input_name: x})[0]
+
+
+def file_hash(path):
+    """SHA-256 of a file, used to key the exported artifacts to their source model."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def exported_path(source_path, backend, quantization=None):
+    """Location of the cached conversion of `source_path` (Models/exported/<name>.<hash>[.<quantization>].<ext>)."""
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    export_dir = os.path.join(os.path.dirname(source_path), "exported")
+    suffix = f".{quantization}" if quantization else ""
+    return os.path.join(export_dir, f"{name}.{file_hash(source_path)[:16]}{suffix}{EXPORT_FORMATS[backend]}")
+
+
+def warm_up(model, batch_sizes=(1,)):
+    """Predict zeros once per batch size the app uses, so the first real prediction doesn't pay for
+    tracing and kernel initialisation. Returns {batch size: seconds}.
+    """
+    timings = {}
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        model.predict(np.zeros((batch_size,) + tuple(model.input_shape), dtype=np.float32))
+        timings[batch_size] = time.perf_counter() - start
+    return timings
+
+
+def load_inference_model(path, backend="keras", mode="compiled", jit_compile=False, quantization=None):
+    """Load a `.h5` model for the chosen backend; all of them expose `predict(x)` and `input_shape`.
+
+    The TFLite and ONNX backends need the model converted first with
+    `python Preprocessing/export_models.py`; they never import TensorFlow's Keras.
+    A `quantization` variant (see QUANTIZATIONS) always runs on TFLite and is
+    produced by `python Preprocessing/quantize_models.py`.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}, expected one of {BACKENDS}")
+    if quantization is not None:
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization {quantization!r}, expected one of {QUANTIZATIONS}")
+        backend = "tflite"
+
+    if backend == "keras":
+        from tensorflow.keras.models import load_model
+        return CompiledModel(load_model(path), mode=mode, jit_compile=jit_compile)
+
+    artifact = exported_path(path, backend, quantization)
+    if not os.path.exists(artifact):
+        tool = "quantize_models.py" if quantization else "export_models.py"
+        raise FileNotFoundError(f"{artifact} not found, run `python Preprocessing/{tool}` to convert {path}")
+    return TFLiteModel(artifact) if backend == "tflite" else OnnxModel(artifact)
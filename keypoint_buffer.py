@@ -0,0 +1,113 @@
+import numpy as np
+
+from constants import PREDICTION_INTERVAL, STRIDE, WINDOW_SIZE
+from keypoints import N_KEYPOINTS
+
+
+class KeypointRingBuffer:
+    """Fixed-capacity sliding window of keypoint frames backed by one float32 array.
+
+    Every frame is written twice (slot and slot + capacity) so the most recent
+    `window_size` frames are always contiguous in memory and can be handed to
+    the model as a view, without stacking or copying.
+
+    There is a single writer (the camera thread). Readers never take a lock:
+    they grab a view together with its frame number and can check afterwards
+    with `is_intact` whether the writer has overwritten it in the meantime.
+    The view stays valid while fewer than `capacity - window_size` further
+    frames have been written.
+    """
+
+    def __init__(self, window_size, stride=None, interval=None, capacity=None, n_features=N_KEYPOINTS):
+        capacity = capacity or window_size * 2
+        if capacity <= window_size:
+            raise ValueError("capacity must be larger than window_size")
+
+        self.window_size = window_size  # Frames per model input
+        self.stride = stride if stride is not None else window_size  # Frames kept after a prediction
+        self.interval = interval  # Predict every `interval` frames (None = whenever a window is full)
+        self.capacity = capacity
+        self.n_features = n_features
+
+        self._data = np.zeros((capacity * 2, n_features), dtype=np.float32)
+        self._count = 0  # Total frames written
+        self._filled = 0  # Frames collected since the last reset/advance
+
+    def __len__(self):
+        return min(self._filled, self.window_size)
+
+    @property
+    def frame_count(self):
+        return self._count
+
+    def push(self, keypoints):
+        """Append one frame of keypoints, overwriting the oldest when full."""
+        self.reserve()[:] = keypoints
+        self.commit()
+
+    def reserve(self):
+        """Row for the next frame, to be filled in place (e.g. by extract_keypoints_into) before `commit`."""
+        return self._data[self._count % self.capacity]
+
+    def commit(self):
+        """Publish the frame written into the row returned by `reserve`."""
+        slot = self._count % self.capacity
+        self._data[slot + self.capacity] = self._data[slot]
+        # Publish the frame only after both copies are written
+        self._count += 1
+        self._filled += 1
+
+    def is_full(self):
+        return self._filled >= self.window_size
+
+    def ready(self):
+        """True when a full window is available and the prediction interval is due."""
+        if not self.is_full():
+            return False
+        return self.interval is None or self._count % self.interval == 0
+
+    def window(self, count=None):
+        """Zero-copy (window_size, n_features) view of the newest frames."""
+        count = self._count if count is None else count
+        end = (count - 1) % self.capacity + self.capacity + 1
+        return self._data[end - self.window_size:end]
+
+    def model_input(self, channels_last=False):
+        """Window shaped for the model: (1, window, features) or (1, window, features, 1) for the CNN."""
+        view = self.window()[np.newaxis]
+        if channels_last:
+            view = view[..., np.newaxis]
+        return view
+
+    def snapshot(self):
+        """Lock-free read for other consumers: returns (frame_number, view)."""
+        count = self._count
+        return count, self.window(count)
+
+    def is_intact(self, count):
+        """Whether a view taken at `count` has not been overwritten by the writer since."""
+        # The frame being written may already overwrite the slot after the newest one
+        return self._count - count < self.capacity - self.window_size
+
+    def copy_window(self, out=None):
+        """Consistent copy of the newest window, retried if the writer overtakes the read."""
+        if out is None:
+            out = np.empty((self.window_size, self.n_features), dtype=np.float32)
+        while True:
+            count, view = self.snapshot()
+            np.copyto(out, view)
+            if self.is_intact(count):
+                return out
+
+    def advance(self):
+        """Slide the window after a prediction, keeping the newest `stride` frames."""
+        self._filled = min(self._filled, self.stride)
+
+    def clear(self):
+        self._count = 0
+        self._filled = 0
+
+
+def camera_buffer(window_size=WINDOW_SIZE, stride=STRIDE, interval=PREDICTION_INTERVAL):
+    """The windowed LSTM's camera buffer: predict every `interval` frames on the newest `window_size`."""
+    return KeypointRingBuffer(window_size, stride=stride, interval=interval)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from inference import file_hash
+from keypoints import N_KEYPOINTS
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".keypoint_cache")
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+class KeypointCache:
+    """On-disk cache of extracted keypoints, keyed by video content, detector config and sampled frames.
+
+    Each (video, detector config, frame indices) is one `.npz` file holding the
+    keypoints of those frames as float32 (what the models take anyway). An
+    entry is only ever filled by one extraction of the whole index set: the
+    detector tracks from frame to frame, so rows extracted in separate runs
+    aren't interchangeable. If the video ended before the last index, the entry
+    holds the frames it had, so hits on it stop at the same frame without
+    trying to extract the rest again.
+    Reading an entry refreshes its modification time, and the least
+    recently used entries are deleted once the folder exceeds `max_bytes`.
+    Entries are written to a temporary file and renamed, so concurrent
+    processes never read a half-written one.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0  # Frames served from the cache
+        self.misses = 0  # Frames that had to be extracted
+        self._hashes = {}  # (path, size, mtime) -> content hash, so a file is hashed once per session
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries()), "bytes": sum(size for _, _, size in self._entries())}
+
+    def video_hash(self, path):
+        info = os.stat(path)
+        key = (os.path.abspath(path), info.st_size, info.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_hash(path)
+        return self._hashes[key]
+
+    def entry_path(self, path, config, indices):
+        key = json.dumps({"config": config, "indices": list(indices)}, sort_keys=True)
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{self.video_hash(path)[:24]}-{key_hash[:16]}.npz")
+
+    def load(self, entry, indices):
+        """Keypoints stored for exactly `indices`, or None if there is no such entry."""
+        try:
+            with np.load(entry) as data:
+                stored, keypoints = data["indices"], data["keypoints"]
+            os.utime(entry)  # Mark as recently used
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return None
+        if not np.array_equal(stored, indices):  # A hash collision
+            return None
+        return keypoints
+
+    def save(self, entry, indices, keypoints):
+        os.makedirs(self.directory, exist_ok=True)
+        indices = np.asarray(indices, dtype=np.int64)
+        keypoints = np.asarray(keypoints, dtype=np.float32).reshape(-1, N_KEYPOINTS)
+        tmp_path = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, indices=indices, keypoints=keypoints)
+        os.replace(tmp_path, entry)
+        self.evict()
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                try:
+                    info = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:  # Evicted by another process
+                    continue
+                entries.append((info.st_mtime, name, info.st_size))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, name, size in entries[:-1]:  # Never the entry just written
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, name, _ in self._entries():
+            os.remove(os.path.join(self.directory, name))
+
+    def keypoints(self, path, indices, config, extract):
+        """Keypoints of `indices` (in order), running `extract(indices)` unless this exact set is cached.
+
+        `extract` returns the keypoints of the frames it could decode, in order;
+        as with a direct extraction, the result stops at the first frame the
+        video doesn't have.
+        """
+        indices = list(indices)
+        entry = self.entry_path(path, config, indices)
+        keypoints = self.load(entry, indices)
+        if keypoints is not None:
+            self.hits += len(keypoints)
+            return keypoints
+
+        self.misses += len(indices)
+        keypoints = np.asarray(extract(indices), dtype=np.float32).reshape(-1, N_KEYPOINTS)
+        self.save(entry, indices, keypoints)
+        return keypoints
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache in DEFAULT_CACHE_DIR, shared by the app and classify_videos.py."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = KeypointCache()
+    return _default_cache
@@ -0,0 +1,127 @@
+import numpy as np
+
+# Keypoint layout: pose (33 x [x, y, z, visibility]) + left hand + right hand (21 x [x, y, z])
+POSE_LANDMARKS = 33
+HAND_LANDMARKS = 21
+POSE_SIZE = POSE_LANDMARKS * 4
+HAND_SIZE = HAND_LANDMARKS * 3
+N_KEYPOINTS = POSE_SIZE + 2 * HAND_SIZE  # 258
+
+# Protobuf wire tags of the fixed32 fields of NormalizedLandmark: x, y, z, visibility, presence
+_FLOAT_TAGS = bytes([0x0D, 0x15, 0x1D, 0x25, 0x2D])
+_RECORD_TAG = 0x0A  # `repeated NormalizedLandmark landmark = 1`
+
+
+def _decode(data, count, n, n_values):
+    """Floats of `count` concatenated serialized landmark lists as a (count * n, n_values) view, or None.
+
+    Every landmark is encoded as [tag, length, (field tag, 4 byte float) * fields],
+    so lists whose landmarks all carry the same fields form a fixed-stride byte
+    table and the floats can be read in place without touching the landmark objects.
+    """
+    rows = count * n
+    record, remainder = divmod(len(data), rows)
+    n_fields, extra = divmod(record - 2, 5)
+    if remainder or extra or not n_values <= n_fields <= len(_FLOAT_TAGS):
+        return None
+
+    heads = np.ndarray((rows, 2), dtype=np.uint8, buffer=data, offset=0, strides=(record, 1))
+    tags = np.ndarray((rows, n_fields), dtype=np.uint8, buffer=data, offset=2, strides=(record, 5))
+    if heads.tobytes() != bytes([_RECORD_TAG, record - 2]) * rows or tags.tobytes() != _FLOAT_TAGS[:n_fields] * rows:
+        return None
+    return np.ndarray((rows, n_values), dtype='<f4', buffer=data, offset=3, strides=(record, 5))
+
+
+def _landmarks_slow(landmark_list, out, n_values):
+    """Per-landmark copy for lists with missing fields or an unexpected encoding."""
+    values = out.reshape(-1, n_values)
+    for i, res in enumerate(landmark_list.landmark):
+        values[i] = (res.x, res.y, res.z, res.visibility)[:n_values]
+
+
+def _landmarks_into(landmark_list, out, n_values):
+    """Copy the first `n_values` floats of every landmark into the flat `out` view."""
+    if not landmark_list:
+        out[:] = 0
+        return
+    values = _decode(landmark_list.SerializeToString(), 1, len(out) // n_values, n_values)
+    if values is None:
+        _landmarks_slow(landmark_list, out, n_values)
+    else:
+        out.reshape(values.shape)[...] = values
+
+
+def _landmarks_batch_into(landmark_lists, out, n_values):
+    """Fill the (N, n * n_values) `out` block from N landmark lists, decoding equal layouts together."""
+    n = out.shape[1] // n_values
+    groups = {}
+    for row, landmark_list in enumerate(landmark_lists):
+        if landmark_list:
+            data = landmark_list.SerializeToString()
+            groups.setdefault(len(data), ([], []))
+            groups[len(data)][0].append(row)
+            groups[len(data)][1].append(data)
+        else:
+            out[row] = 0
+
+    for rows, chunks in groups.values():
+        values = _decode(b"".join(chunks), len(rows), n, n_values)
+        if values is None:
+            for row in rows:
+                _landmarks_slow(landmark_lists[row], out[row], n_values)
+        else:
+            out[rows] = values.reshape(len(rows), -1)
+
+
+def extract_keypoints_into(results, out):
+    """Fill a preallocated (258,) buffer with the keypoints of one Holistic result."""
+    keypoints = getattr(results, "keypoints", None)
+    if keypoints is not None:  # detection.LandmarkResults, already in this layout
+        out[:] = keypoints
+        return out
+    _landmarks_into(results.pose_landmarks, out[:POSE_SIZE], 4)
+    _landmarks_into(results.left_hand_landmarks, out[POSE_SIZE:POSE_SIZE + HAND_SIZE], 3)
+    _landmarks_into(results.right_hand_landmarks, out[POSE_SIZE + HAND_SIZE:], 3)
+    return out
+
+
+def extract_keypoints(results):
+    """Keypoints of one Holistic result as a new float64 (258,) array, same as the original helper."""
+    return extract_keypoints_into(results, np.empty(N_KEYPOINTS))
+
+
+def extract_keypoints_batch(results_list, out=None, dtype=np.float32):
+    """Convert a list of Holistic results into an (N, 258) array in one call."""
+    if out is None:
+        out = np.empty((len(results_list), N_KEYPOINTS), dtype=dtype)
+    if results_list and getattr(results_list[0], "keypoints", None) is not None:
+        for row, results in zip(out, results_list):
+            row[:] = results.keypoints
+        return out
+    _landmarks_batch_into([r.pose_landmarks for r in results_list], out[:, :POSE_SIZE], 4)
+    _landmarks_batch_into([r.left_hand_landmarks for r in results_list], out[:, POSE_SIZE:POSE_SIZE + HAND_SIZE], 3)
+    _landmarks_batch_into([r.right_hand_landmarks for r in results_list], out[:, POSE_SIZE + HAND_SIZE:], 3)
+    return out
+
+
+# Slices of the pose and hand blocks, interpolated independently
+PARTS = (slice(0, POSE_SIZE), slice(POSE_SIZE, POSE_SIZE + HAND_SIZE), slice(POSE_SIZE + HAND_SIZE, N_KEYPOINTS))
+
+
+def interpolate_keypoints(start, end, steps, out=None):
+    """(steps, 258) keypoints of the frames between two detected frames `start` and `end`.
+
+    Parts detected in both frames move linearly; a part missing (all zeros) in
+    either frame isn't interpolated from/to zero but takes the value of the
+    nearer of the two frames, as a hand appearing or leaving would have.
+    """
+    if out is None:
+        out = np.empty((steps, N_KEYPOINTS), dtype=np.float32)
+    t = (np.arange(1, steps + 1, dtype=np.float32) / (steps + 1))[:, np.newaxis]
+    for part in PARTS:
+        a, b = start[part], end[part]
+        if a.any() and b.any():
+            out[:, part] = a + t * (b - a)
+        else:
+            out[:, part] = np.where(t < 0.5, a, b)
+    return out
@@ -0,0 +1,60 @@
+"""Pose and hand skeletons drawn straight from the 258-float keypoint vector.
+
+`mp_drawing.draw_landmarks` walks the landmark protos in Python and makes a
+cv2 call per connection and per landmark. Here each part is one array
+operation to pixel coordinates and two `cv2.polylines` calls: one for all of
+its connections, one for all of its landmarks (zero-length segments, which
+the round line caps turn into dots).
+"""
+import cv2
+import numpy as np
+
+from keypoints import HAND_SIZE, POSE_SIZE
+
+VISIBILITY_THRESHOLD = 0.5  # Pose landmarks below it aren't drawn, as in mp_drawing
+
+# Landmark index pairs of mp.solutions.pose.POSE_CONNECTIONS and mp.solutions.hands.HAND_CONNECTIONS
+POSE_CONNECTIONS = np.array([
+    (0, 1), (0, 4), (1, 2), (2, 3), (3, 7), (4, 5), (5, 6), (6, 8), (9, 10), (11, 12), (11, 13), (11, 23),
+    (12, 14), (12, 24), (13, 15), (14, 16), (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22),
+    (17, 19), (18, 20), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29), (27, 31), (28, 30),
+    (28, 32), (29, 31), (30, 32)])
+HAND_CONNECTIONS = np.array([
+    (0, 1), (0, 5), (0, 17), (1, 2), (2, 3), (3, 4), (5, 6), (5, 9), (6, 7), (7, 8), (9, 10), (9, 13),
+    (10, 11), (11, 12), (13, 14), (13, 17), (14, 15), (15, 16), (17, 18), (18, 19), (19, 20)])
+
+# (keypoint slice, values per landmark, connections, landmark color, connection color, landmark radius):
+# the styles of the old draw_styled_landmarks, with the colors as RGB since the frames are RGB
+PARTS = (
+    (slice(0, POSE_SIZE), 4, POSE_CONNECTIONS, (10, 22, 80), (121, 44, 80), 3),
+    (slice(POSE_SIZE, POSE_SIZE + HAND_SIZE), 3, HAND_CONNECTIONS, (76, 22, 121), (250, 44, 121), 3),
+    (slice(POSE_SIZE + HAND_SIZE, POSE_SIZE + 2 * HAND_SIZE), 3, HAND_CONNECTIONS, (66, 117, 245), (230, 66, 245), 3),
+)
+
+
+def draw_keypoints(image, keypoints, thickness=1):
+    """Draw the skeletons of a (258,) keypoint vector on `image` (H, W, 3) in place; returns `image`.
+
+    Parts that weren't detected (all zeros) are skipped, and so are landmarks
+    outside the image or, for the pose, below VISIBILITY_THRESHOLD, with their
+    connections.
+    """
+    height, width = image.shape[:2]
+    for part, n_values, connections, point_color, line_color, radius in PARTS:
+        landmarks = keypoints[part].reshape(-1, n_values)
+        if not landmarks.any():
+            continue
+        xy = landmarks[:, :2]
+        shown = ((xy >= 0) & (xy <= 1)).all(1)
+        if n_values == 4:
+            shown &= landmarks[:, 3] >= VISIBILITY_THRESHOLD
+        points = np.rint(xy * (width - 1, height - 1)).astype(np.int32)
+
+        lines = connections[shown[connections].all(1)]
+        if len(lines):
+            cv2.polylines(image, points[lines], False, line_color, thickness)
+        dots = points[shown]
+        if len(dots):
+            cv2.polylines(image, np.stack([dots, dots], 1), False, point_color, 2 * radius)
+    return image
+
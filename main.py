@@ -1,21 +1,22 @@
+import startup  # First: starts the startup clock
 import sys
-import platform
-import cv2
-import numpy as np
-import mediapipe as mp
 import time
-import pyrealsense2 as rs
-import threading
-from tensorflow.keras.models import load_model
+for module in ("numpy", "PySide6.QtGui", "PySide6.QtWidgets", "ui_main"):
+    startup.timed_import(module)  # Recorded for the startup report (STARTUP_REPORT=1)
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import (QCoreApplication, QPropertyAnimation, QDate, QDateTime, QMetaObject, QObject, QPoint, QRect, QSize, QTime, QUrl, Qt, QEvent, QThread, Signal)
 from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor, QFont, QFontDatabase, QIcon, QKeySequence, QLinearGradient, QPalette, QPainter, QPixmap, QRadialGradient, QImage)
 from PySide6.QtWidgets import *
 
+# OpenCV, MediaPipe, TensorFlow and pyrealsense2 aren't imported here: the UI
+# functions load them in the background once the camera or video page is opened
+
 # GUI FILE
-from ui_maint Ui_MainWindow
+from ui_main import Ui_MainWindow
 
 # IMPORT FUNCTIONS
+startup.timed_import("ui_functions_CNN")
 from ui_functions_CNN import *
 
 class MainWindow(QMainWindow):
@@ -41,6 +42,10 @@ class MainWindow(QMainWindow):
 
         self.show()
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        startup.mark("first_paint")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
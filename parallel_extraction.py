@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from detection import mediapipe_detection, open_detector
+from keypoints import N_KEYPOINTS, extract_keypoints_into
+from video_io import VideoHandle, fit_frame, open_video, read_frames
+
+PARALLEL_MIN_FRAMES = 120  # Below this, starting the workers costs more than it saves
+CHUNK_FRAMES = 60  # Frames per chunk; every chunk gets a fresh detector, in-process or in a worker
+OVERLAP_FRAMES = 5  # Frames each chunk re-detects before its range so Holistic is tracking at the boundary
+
+_pool = None
+_pool_workers = 0
+
+
+def _extract_chunk(path, indices, warmup, preview_size=None):
+    """(keypoints, previews) of `indices[warmup:]`; the first `warmup` frames only prime the tracker.
+
+    `previews` are the same frames scaled to `preview_size` with `fit_frame`,
+    or empty without it. Every call opens its own detector, so the result
+    depends only on its arguments, never on which chunks or videos the worker
+    processed before.
+    """
+    keypoints = np.zeros((len(indices) - warmup, N_KEYPOINTS), dtype=np.float64)
+    previews = []
+    decoded = 0
+    with open_detector() as detector:
+        for position, (index, frame) in enumerate(read_frames(path, indices)):
+            image, results = mediapipe_detection(frame, detector)
+            if position >= warmup:
+                extract_keypoints_into(results, keypoints[position - warmup])
+                if preview_size:
+                    previews.append(fit_frame(frame, preview_size))
+            decoded = position + 1
+    return keypoints[:max(0, decoded - warmup)], previews  # The video may end before its reported frame count
+
+
+def split_chunks(indices, chunk_frames=CHUNK_FRAMES, overlap=OVERLAP_FRAMES):
+    """Contiguous (chunk_indices, warmup) ranges of `chunk_frames`, each prefixed by up to `overlap` earlier indices."""
+    chunks = []
+    for start in range(0, len(indices), chunk_frames):
+        warm_start = max(0, start - overlap)
+        chunks.append((list(indices[warm_start:start + chunk_frames]), start - warm_start))
+    return chunks
+
+
+def get_pool(workers):
+    """Process pool of `workers` processes with MediaPipe imported, kept alive between videos."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        # Forking a process that already runs MediaPipe graphs (threads, GL context) crashes the child
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+def extract_video_keypoints(video, indices=None, workers=None, overlap=OVERLAP_FRAMES, chunk_frames=CHUNK_FRAMES,
+                            preview_size=None):
+    """Ordered (len(indices), 258) keypoints of the given frames (default: every frame).
+
+    The indices are split into contiguous chunks of `chunk_frames`, each run by a
+    freshly opened detector that first re-detects the `overlap` frames before
+    it, so it is tracking (not re-detecting from scratch) when its range
+    starts. Holistic's tracking never converges back onto another run's after a
+    restart, so the chunks are the same whatever the number of workers: the
+    result only depends on the video and the indices.
+    `workers=None` uses every core for long videos and stays in-process otherwise.
+    Frames past the real end of the video are dropped.
+
+    With `preview_size` (width, height) returns (keypoints, frames): the
+    decoded frames scaled to fit in it as well, so a preview needs no second pass.
+    """
+    path = video.path if isinstance(video, VideoHandle) else video
+    if indices is None:
+        indices = range(len(video if isinstance(video, VideoHandle) else open_video(path)))
+    indices = list(indices)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(indices) >= PARALLEL_MIN_FRAMES else 1
+
+    chunks = split_chunks(indices, chunk_frames, overlap)
+    if workers <= 1 or len(chunks) < 2:
+        parts = [_extract_chunk(path, chunk, warmup, preview_size) for chunk, warmup in chunks]
+    else:
+        pool = get_pool(workers)
+        futures = [pool.submit(_extract_chunk, path, chunk, warmup, preview_size) for chunk, warmup in chunks]
+        parts = [future.result() for future in futures]
+    keypoints = (np.concatenate([part for part, _ in parts]) if parts
+                 else np.zeros((0, N_KEYPOINTS), dtype=np.float64))
+    if preview_size:
+        return keypoints, [frame for _, previews in parts for frame in previews]
+    return keypoints
@@ -0,0 +1,88 @@
+import time
+from collections import deque
+
+import numpy as np
+
+REPORT_INTERVAL = 0.5  # Seconds between overlay updates
+STAGES = ("capture_wait", "holistic", "keypoints", "inference", "overlay", "ui_delivery", "end_to_end")
+STAGE_LABELS = {"capture_wait": "Capture wait", "holistic": "Holistic", "keypoints": "Keypoints",
+                "inference": "Inference", "overlay": "Overlay", "ui_delivery": "UI delivery",
+                "end_to_end": "End to end"}
+
+
+class PerformanceMonitor:
+    """Rolling timings of the real-time stages, for the performance overlay.
+
+    Stages call `add(stage, seconds)` only while `enabled` is set, so with the
+    overlay hidden the only cost is that attribute check. Samples go into
+    bounded deques (appends are atomic), so the stage threads never lock.
+    """
+
+    def __init__(self, window=120):
+        self.enabled = False
+        self.window = window
+        self._samples = {stage: deque(maxlen=window) for stage in STAGES}
+        self._captures = deque(maxlen=window)  # Timestamps of captured frames
+        self._detections = deque(maxlen=window)  # Timestamps of frames that went through the detector
+
+    def add(self, stage, seconds):
+        self._samples[stage].append(seconds)
+
+    def frame_captured(self, timestamp):
+        self._captures.append(timestamp)
+
+    def frame_detected(self, timestamp):
+        self._detections.append(timestamp)
+
+    def fps(self):
+        return _rate(self._captures)
+
+    def detection_fps(self):
+        return _rate(self._detections)
+
+    def reset(self):
+        for samples in self._samples.values():
+            samples.clear()
+        self._captures.clear()
+        self._detections.clear()
+
+    def snapshot(self, queue_stats=None):
+        """{"fps", "detection_fps", "dropped": {queue: count}, "stages": {stage: {"mean_ms", "p95_ms"}}} over the recent samples."""
+        stages = {}
+        for stage, samples in self._samples.items():
+            values = np.array(samples, dtype=np.float64) * 1000
+            if len(values):
+                stages[stage] = {"mean_ms": float(values.mean()), "p95_ms": float(np.percentile(values, 95))}
+        dropped = {queue: stats["dropped"] for queue, stats in (queue_stats or {}).items()}
+        return {"fps": self.fps(), "detection_fps": self.detection_fps(), "dropped": dropped, "stages": stages}
+
+
+def _rate(timestamps):
+    timestamps = list(timestamps)
+    if len(timestamps) < 2 or timestamps[-1] <= timestamps[0]:
+        return 0.0
+    return (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+
+
+def format_snapshot(snapshot):
+    """Overlay text for a `PerformanceMonitor.snapshot`."""
+    lines = [f"{snapshot['fps']:5.1f} fps" + (f"   coalesced {snapshot['coalesced']}" if "coalesced" in snapshot else "")]
+    dropped = snapshot["dropped"]
+    if dropped:
+        # The detection and display queues carry frames, the classification queue keypoint windows
+        frames = ", ".join(f"{queue} {count}" for queue, count in dropped.items() if queue != "classification")
+        lines.append(f"dropped frames: {frames}   windows: {dropped.get('classification', 0)}")
+    detection = f"{snapshot.get('detection_fps', 0):5.1f} fps detected"
+    if snapshot.get("detect_every", 1) > 1:
+        detection += f" (every {snapshot['detect_every']}, rest interpolated)"
+    lines.append(detection)
+    for stage in STAGES:
+        stats = snapshot["stages"].get(stage)
+        if stats:
+            lines.append(f"{STAGE_LABELS[stage]:<13}{stats['mean_ms']:7.1f} ms  p95 {stats['p95_ms']:6.1f}")
+    return "\n".join(lines)
+
+
+def now():
+    """Wall-clock seconds, the clock frame timestamps are compared against for end-to-end latency."""
+    return time.time()
@@ -0,0 +1,337 @@
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from keypoints import N_KEYPOINTS, extract_keypoints_into, interpolate_keypoints
+from performance import PerformanceMonitor, now
+
+
+class DropOldestQueue:
+    """Bounded queue between two stages; a full queue discards its oldest item instead of blocking.
+
+    `on_drop(item)` is called for every item discarded, by `put` or `clear`.
+    """
+
+    def __init__(self, maxsize, name="", on_drop=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self.maxsize:
+                self.dropped += 1  # deque(maxlen) pushes the oldest item out
+                if self.on_drop:
+                    self.on_drop(self._items[0])
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Oldest item, or None after `timeout` seconds or once the queue is closed."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            if self.on_drop:
+                for item in self._items:
+                    self.on_drop(item)
+            self._items.clear()
+
+    def stats(self):
+        return {"depth": len(self._items), "maxsize": self.maxsize, "put": self.put_count, "dropped": self.dropped}
+
+
+class FrameMailbox:
+    """Single-slot hand-off of the newest frame to the GUI.
+
+    Posting over a frame the GUI hasn't taken yet replaces it (counted in
+    `coalesced`, and handed to `on_replace`), so however long the GUI thread is
+    busy at most one frame waits for it and the preview resumes with the newest one.
+    """
+
+    def __init__(self, on_replace=None):
+        self.on_replace = on_replace
+        self._item = None
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.taken = 0
+        self.coalesced = 0
+
+    def post(self, item):
+        with self._lock:
+            replaced, self._item = self._item, item
+            self.posted += 1
+            if replaced is not None:
+                self.coalesced += 1
+        if replaced is not None and self.on_replace:
+            self.on_replace(replaced)
+
+    def take(self):
+        """The newest item, or None if nothing new was posted since the last call."""
+        with self._lock:
+            item, self._item = self._item, None
+            if item is not None:
+                self.taken += 1
+            return item
+
+    def clear(self):
+        with self._lock:
+            item, self._item = self._item, None
+        if item is not None and self.on_replace:
+            self.on_replace(item)
+
+    def stats(self):
+        return {"posted": self.posted, "taken": self.taken, "coalesced": self.coalesced}
+
+
+class DetectionRate:
+    """Adaptive detection rate: run the detector on every `every`-th captured frame.
+
+    Keeps moving averages of the detection time and of the capture period and
+    raises `every` as soon as detection can't keep up with the camera (with
+    `headroom` to spare), lowering it again only once it comfortably could.
+    """
+
+    def __init__(self, max_every=3, headroom=0.9, smoothing=0.1):
+        self.max_every = max_every
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.every = 1
+        self.detect_time = None  # Seconds per detection
+        self.frame_period = None  # Seconds between captured frames
+        self._last_capture = None
+
+    def _average(self, average, value):
+        return value if average is None else average + self.smoothing * (value - average)
+
+    def frame_captured(self, clock):
+        if self._last_capture is not None:
+            self.frame_period = self._average(self.frame_period, clock - self._last_capture)
+        self._last_capture = clock
+
+    def detected(self, seconds):
+        self.detect_time = self._average(self.detect_time, seconds)
+        if not self.frame_period:
+            return
+        budget = self.frame_period * self.headroom
+        needed = min(self.max_every, max(1, math.ceil(self.detect_time / budget)))
+        if needed > self.every:
+            self.every = needed
+        elif needed < self.every and self.detect_time < budget * (self.every - 1) * 0.8:
+            self.every -= 1  # Step down one at a time, with a margin against flapping
+
+    def due(self, index):
+        return index % self.every == 0
+
+    def fps(self):
+        """Detections per second at the current rate."""
+        return 1 / (self.frame_period * self.every) if self.frame_period else 0.0
+
+
+class StagePipeline:
+    """Real-time page as independent stages: capture -> landmark detection -> classification.
+
+    Each stage runs in its own thread and hands its output to the next one through
+    a DropOldestQueue, so a slow `model.predict` only ever delays predictions and
+    never frame acquisition. Captured frames are also put on `display_queue`,
+    which the CameraThread drains to update the preview, as (frame, timestamp)
+    pairs.
+
+    With a `frame_pool` (the source's FramePool) the pipeline takes over the
+    frame `read_frame` returned: the detection stage releases it once
+    detected, a queue when it drops it, and whoever takes it from
+    `display_queue` must release it too.
+
+    read_frame()            -> frame (np.ndarray) or None
+    open_detector()         -> context manager yielding a detector (e.g. Holistic)
+    detect(frame, detector) -> (image, results), i.e. `mediapipe_detection`
+    classify(window)        -> called with a copy of each full keypoint window
+    frame_timestamp()       -> optional, wall-clock capture time of the last frame read
+                               (defaults to the time read_frame returned)
+
+    While `monitor.enabled` is set, every stage records its timings in the
+    PerformanceMonitor.
+
+    With `adaptive` set, the detector only sees every `rate.every`-th frame
+    once it can't keep up with the camera, and the keypoints of the frames it
+    skipped (or the detection queue dropped) are interpolated, so the buffer
+    always holds one row per captured frame: a window keeps the time base of
+    the training sequences.
+    """
+
+    POLL_TIMEOUT = 0.1  # Seconds a stage waits on its queue before re-checking `running`
+
+    def __init__(self, read_frame, open_detector, detect, buffer, classify,
+                 detection_queue_size=2, classification_queue_size=1, display_queue_size=2,
+                 frame_timestamp=None, monitor=None, adaptive=False, rate=None, frame_pool=None):
+        self.read_frame = read_frame
+        self.open_detector = open_detector
+        self.detect = detect
+        self.buffer = buffer  # KeypointRingBuffer, written only by the detection stage
+        self.classify = classify
+        self.frame_timestamp = frame_timestamp or now
+        self.monitor = monitor or PerformanceMonitor()
+        self.adaptive = adaptive
+        self.rate = rate or DetectionRate()
+        self.frame_pool = frame_pool
+
+        self.detection_queue = DropOldestQueue(detection_queue_size, "detection",
+                                               on_drop=lambda item: self.release_frame(item[1]))
+        self.classification_queue = DropOldestQueue(classification_queue_size, "classification")
+        self.display_queue = DropOldestQueue(display_queue_size, "display",
+                                             on_drop=lambda item: self.release_frame(item[0]))
+
+        self.running = False
+        self.frame_counter = 0  # Frames captured
+        self.detected_counter = 0  # Frames that went through the detector
+        self.interpolated_counter = 0  # Frames whose keypoints were interpolated (adaptive mode)
+        self._last_index = None  # Capture index of the last detected frame
+        self._last_keypoints = np.zeros(N_KEYPOINTS, dtype=np.float32)
+        self.latest_keypoints = None  # Copy of the newest detected frame's keypoints, e.g. for the landmark overlay
+        self.error = None  # (stage name, exception) of the first stage that raised
+        self._threads = []
+
+    def start(self):
+        self.running = True
+        self.error = None
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(name, loop), name=name, daemon=True)
+            for name, loop in (("capture", self._capture_loop), ("detection", self._detection_loop),
+                               ("classification", self._classification_loop))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self.running = False
+        for queue in (self.detection_queue, self.classification_queue, self.display_queue):
+            queue.close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for queue in (self.detection_queue, self.display_queue):
+            queue.clear()
+
+    def release_frame(self, frame):
+        """Give a frame taken from `display_queue` back to the frame pool."""
+        if self.frame_pool is not None:
+            self.frame_pool.release(frame)
+
+    def alive(self):
+        """True while every stage thread is running (a stage that raised has stopped, see `error`)."""
+        return bool(self._threads) and all(thread.is_alive() for thread in self._threads)
+
+    def _run_stage(self, name, loop):
+        try:
+            loop()
+        except Exception as error:
+            if self.error is None:
+                self.error = (name, error)
+            raise
+
+    def stats(self):
+        """Depth and drop counters of every queue."""
+        return {queue.name: queue.stats() for queue in (self.detection_queue, self.classification_queue, self.display_queue)}
+
+    def _capture_loop(self):
+        monitor = self.monitor
+        while self.running:
+            timing = monitor.enabled
+            if timing:
+                start = time.perf_counter()
+            frame = self.read_frame()
+            if frame is None:
+                continue
+            timestamp = self.frame_timestamp()
+            if timing:
+                monitor.add("capture_wait", time.perf_counter() - start)
+                monitor.frame_captured(timestamp)
+            index = self.frame_counter
+            self.frame_counter += 1
+            if self.adaptive:
+                self.rate.frame_captured(time.perf_counter())
+            if not self.adaptive or self.rate.due(index):
+                if self.frame_pool is not None:
+                    self.frame_pool.retain(frame)  # Held by the detection stage and by the display
+                self.detection_queue.put((index, frame))
+            self.display_queue.put((frame, timestamp))
+
+    def _detection_loop(self):
+        with self.open_detector() as detector:
+            while self.running:
+                item = self.detection_queue.get(self.POLL_TIMEOUT)
+                if item is None:
+                    continue
+                index, frame = item
+
+                timing = self.monitor.enabled
+                start = time.perf_counter()
+                image, results = self.detect(frame, detector)
+                self.release_frame(frame)
+                detected = time.perf_counter()
+                if self.adaptive:
+                    self.rate.detected(detected - start)
+                    self._interpolate_gap(index, results)
+                    self.latest_keypoints = self._last_keypoints.copy()
+                else:
+                    self.latest_keypoints = extract_keypoints_into(results, self.buffer.reserve()).copy()
+                    self._commit()
+                if timing:
+                    self.monitor.add("holistic", detected - start)
+                    self.monitor.add("keypoints", time.perf_counter() - detected)
+                    self.monitor.frame_detected(now())
+                self.detected_counter += 1
+
+    def _commit(self):
+        self.buffer.commit()
+        if self.buffer.ready():
+            self.classification_queue.put(self.buffer.copy_window())
+            self.buffer.advance()
+
+    def _interpolate_gap(self, index, results):
+        """Commit the interpolated frames since the last detection, then the detected one."""
+        keypoints = extract_keypoints_into(results, self.buffer.reserve())
+        gap = 0 if self._last_index is None else min(index - self._last_index - 1, self.buffer.window_size)
+        if gap > 0:
+            current = keypoints.copy()  # Its row is reused for the first interpolated frame
+            for row in interpolate_keypoints(self._last_keypoints, current, gap):
+                self.buffer.reserve()[:] = row
+                self._commit()
+            self.interpolated_counter += gap
+            keypoints = self.buffer.reserve()
+            keypoints[:] = current
+        self._last_keypoints[:] = keypoints
+        self._last_index = index
+        self._commit()
+
+    def _classification_loop(self):
+        while self.running:
+            window = self.classification_queue.get(self.POLL_TIMEOUT)
+            if window is None:
+                continue
+            timing = self.monitor.enabled
+            if timing:
+                start = time.perf_counter()
+            self.classify(window)
+            if timing:
+                self.monitor.add("inference", time.perf_counter() - start)
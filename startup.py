@@ -0,0 +1,132 @@
+"""Cold start: show the window first, load the heavy runtimes when a page needs them.
+
+main.py only imports PySide6 and NumPy before MainWindow appears. The first
+time the camera or video page is opened, a RuntimeLoader thread imports the
+deferred modules (OpenCV, MediaPipe, TensorFlow and the app modules built on
+them) and loads the model, while the window shows its progress. A WarmUp
+thread then runs the model and a detector once on dummy inputs, so the first
+real prediction is as fast as the following ones. pyrealsense2
+is never imported here: frame_sources imports it when a RealSense source is
+opened.
+
+With STARTUP_REPORT=1 in the environment, the timings are printed to stderr
+at each milestone: the import time of each module, the warm-up times, and
+the time to first paint, until the runtime was loaded, until it was hot and
+to first prediction, all from the moment main.py started.
+"""
+import importlib
+import os
+import sys
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+START = time.perf_counter()  # main.py imports this module first
+STARTUP_REPORT = bool(os.environ.get("STARTUP_REPORT"))
+MILESTONES = {"first_paint": "First paint", "runtime_loaded": "Runtime loaded", "hot": "Hot",
+              "first_prediction": "First prediction"}
+
+_durations = {}  # Module (or "model") -> seconds its first import (load) took
+_milestones = {}  # Milestone -> seconds since START
+
+
+def timed_import(name):
+    """ Import a module, recording how long it took if it wasn't imported yet. """
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _durations[name] = time.perf_counter() - start
+    return module
+
+
+def timed_load(name, load):
+    """ Call `load()`, recording how long it took under `name`. """
+    start = time.perf_counter()
+    result = load()
+    _durations[name] = time.perf_counter() - start
+    return result
+
+
+def mark(milestone):
+    """ Record the first time a milestone is reached, and print the report then if enabled. """
+    if milestone in _milestones:
+        return
+    _milestones[milestone] = time.perf_counter() - START
+    if STARTUP_REPORT:
+        print(format_report(), file=sys.stderr, flush=True)
+
+
+def format_report():
+    lines = ["Startup, seconds since main.py started:"]
+    for milestone, label in MILESTONES.items():
+        if milestone in _milestones:
+            lines.append(f"  {label:<20}{_milestones[milestone]:7.3f}")
+    lines.append("Imports and loads:")
+    for name, seconds in _durations.items():
+        lines.append(f"  {name:<20}{seconds:7.3f}")
+    return "\n".join(lines)
+
+
+class RuntimeLoader(QThread):
+    """Imports `modules` in order, then calls `load()` (the model), off the GUI thread.
+
+    Emits `progress(step, percent)` before each step, then `loaded()`, or
+    `failed(message)` if an import or the load raised.
+    """
+    progress = Signal(str, int)
+    loaded = Signal()
+    failed = Signal(str)
+
+    def __init__(self, modules, load=None):
+        super().__init__()
+        self.modules = modules
+        self.load = load
+
+    def run(self):
+        steps = len(self.modules) + (self.load is not None)
+        try:
+            for i, name in enumerate(self.modules):
+                self.progress.emit(f"Loading {name}", round(100 * i / steps))
+                timed_import(name)
+            if self.load is not None:
+                self.progress.emit("Loading model", round(100 * len(self.modules) / steps))
+                timed_load("model", self.load)
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+            return
+        self.progress.emit("Ready", 100)
+        self.loaded.emit()
+
+
+class WarmUp(QThread):
+    """Runs `model` on zeros of each of `batch_sizes` and warms a detector in `reserve`, off the GUI thread.
+
+    Either may be None, e.g. to only warm a new detector after the camera
+    stopped. Emits `hot(timings)` when done, or `failed(message)`.
+    """
+    hot = Signal(dict)
+    failed = Signal(str)
+
+    def __init__(self, model=None, batch_sizes=(1,), reserve=None):
+        super().__init__()
+        self.model = model
+        self.batch_sizes = batch_sizes
+        self.reserve = reserve
+
+    def run(self):
+        from inference import warm_up
+        timings = {}
+        try:
+            if self.model is not None:
+                for batch_size, seconds in warm_up(self.model, self.batch_sizes).items():
+                    timings[f"warm-up batch {batch_size}"] = seconds
+            if self.reserve is not None:
+                start = time.perf_counter()
+                self.reserve.warm()
+                timings["warm-up detector"] = time.perf_counter() - start
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+            return
+        _durations.update(timings)
+        self.hot.emit(timings)
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+
+import dataset
+
+ACTIONS = ['a', 'b']
+
+
+def record(data_path, action, sequence, value):
+    folder = os.path.join(data_path, action, str(sequence))
+    os.makedirs(folder, exist_ok=True)
+    for frame_num in range(dataset.SEQUENCE_LENGTH):
+        np.save(os.path.join(folder, f"{frame_num}.npy"), np.full(258, value, dtype=np.float64))
+
+
+def make_tree(tmp_path):
+    data_path = str(tmp_path / 'Dataset')
+    for label, action in enumerate(ACTIONS):
+        for sequence in range(2):
+            record(data_path, action, sequence, label * 10 + sequence)
+    return data_path
+
+
+def test_packed_store_matches_the_folders(tmp_path):
+    data_path = make_tree(tmp_path)
+    store_path = str(tmp_path / 'Dataset.store')
+    dataset.pack_dataset(data_path, store_path, ACTIONS)
+
+    X, y = dataset.load_dataset(data_path, store_path, ACTIONS)
+    assert isinstance(X, np.memmap)
+    expected_X, expected_y = dataset.load_sequences(data_path, ACTIONS)
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+
+
+def test_stale_store_falls_back_to_the_folders(tmp_path):
+    data_path = make_tree(tmp_path)
+    store_path = str(tmp_path / 'Dataset.store')
+    dataset.pack_dataset(data_path, store_path, ACTIONS)
+
+    # A new sequence changes its action folder
+    record(data_path, 'b', 2, 12)
+
+    X, y = dataset.load_dataset(data_path, store_path, ACTIONS)
+    assert not isinstance(X, np.memmap)
+    assert len(X) == 5 and X[4, 0, 0] == 12
+
+
+def test_verify_catches_sequences_rerecorded_in_place(tmp_path):
+    data_path = make_tree(tmp_path)
+    store_path = str(tmp_path / 'Dataset.store')
+    dataset.pack_dataset(data_path, store_path, ACTIONS)
+
+    record(data_path, 'a', 0, 99)
+    os.utime(os.path.join(data_path, 'a', '0', '0.npy'), ns=(2 ** 62, 2 ** 62))
+
+    # Only the folder counts and times are compared by default
+    assert isinstance(dataset.load_dataset(data_path, store_path, ACTIONS)[0], np.memmap)
+    X, y = dataset.load_dataset(data_path, store_path, ACTIONS, verify=True)
+    assert not isinstance(X, np.memmap) and X[0, 0, 0] == 99
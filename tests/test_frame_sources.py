@@ -0,0 +1,83 @@
+import contextlib
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from frame_sources import FramePool
+from keypoint_buffer import KeypointRingBuffer
+from stages import StagePipeline
+
+SHAPE = (4, 4, 3)
+NOBODY = SimpleNamespace(pose_landmarks=None, left_hand_landmarks=None, right_hand_landmarks=None)
+
+
+def test_buffer_is_reused_only_after_its_last_release():
+    pool = FramePool(size=2)
+    frame = pool.acquire(SHAPE)
+    pool.retain(frame)
+    pool.release(frame)
+    assert pool.acquire(SHAPE) is not frame
+    pool.release(frame)
+    assert pool.acquire(SHAPE) is frame
+
+
+def test_pool_stays_bounded_while_every_buffer_is_held():
+    pool = FramePool(size=3)
+    held = [pool.acquire(SHAPE) for _ in range(10)]
+    assert len(pool) == 3 and pool.allocated == 7
+    for frame in held:
+        pool.release(frame)  # Ignored for the arrays outside the pool
+    assert pool.in_use() == 0
+
+
+def test_resolution_change_replaces_free_buffers():
+    pool = FramePool(size=2)
+    pool.release(pool.acquire(SHAPE))
+    pool.acquire((8, 8, 3))
+    assert len(pool) == 1 and pool.allocated == 0
+
+
+def test_pipeline_releases_every_frame():
+    pool = FramePool(size=6)
+
+    def read_frame():
+        time.sleep(0.001)
+        return pool.acquire(SHAPE)
+
+    def detect(frame, detector):
+        time.sleep(0.005)  # Slower than capture, so the detection queue drops frames
+        return frame, NOBODY
+
+    stages = StagePipeline(read_frame, contextlib.nullcontext, detect, KeypointRingBuffer(2, n_features=258),
+                           lambda window: None, frame_pool=pool)
+    stages.start()
+    deadline = time.perf_counter() + 0.5
+    while time.perf_counter() < deadline:
+        item = stages.display_queue.get(stages.POLL_TIMEOUT)
+        if item is not None:
+            stages.release_frame(item[0])
+    assert stages.alive()
+    stages.stop()
+
+    assert stages.detection_queue.dropped and stages.frame_counter > 50
+    assert pool.in_use() == 0
+    assert len(pool) <= 6
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_pipeline_reports_the_stage_that_raised():
+    def detect(frame, detector):
+        raise RuntimeError("detector failed")
+
+    pool = FramePool(size=4)
+    stages = StagePipeline(lambda: pool.acquire(SHAPE), contextlib.nullcontext, detect,
+                           KeypointRingBuffer(2, n_features=258), lambda window: None, frame_pool=pool)
+    stages.start()
+    deadline = time.perf_counter() + 2
+    while stages.alive() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert not stages.alive()
+    stage, error = stages.error
+    assert stage == "detection" and str(error) == "detector failed"
+    stages.stop()
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from keypoint_buffer import KeypointRingBuffer
+
+
+def filled(window_size=3, capacity=5):
+    buffer = KeypointRingBuffer(window_size, capacity=capacity, n_features=1)
+    for i in range(window_size):
+        buffer.push([i])
+    return buffer
+
+
+def test_window_is_the_newest_frames():
+    buffer = filled()
+    buffer.push([3])
+    np.testing.assert_array_equal(buffer.window()[:, 0], [1, 2, 3])
+
+
+def test_view_stays_intact_until_the_next_write_can_reach_it():
+    buffer = filled()
+    count, view = buffer.snapshot()
+    for i in range(buffer.capacity - buffer.window_size - 1):
+        buffer.push([10 + i])
+    assert buffer.is_intact(count)
+
+    buffer.push([20])
+    # `capacity - window_size` frames later the frame being written goes to the view's oldest row,
+    # so a reader can't tell whether it is already torn
+    assert not buffer.is_intact(count)
+    oldest = view[0, 0]
+    buffer.push([30])
+    assert view[0, 0] != oldest
+
+
+def test_capacity_must_exceed_window_size():
+    with pytest.raises(ValueError):
+        KeypointRingBuffer(3, capacity=3)
+
+
+def test_copy_window_returns_the_newest_window():
+    buffer = filled()
+    np.testing.assert_array_equal(buffer.copy_window()[:, 0], [0, 1, 2])
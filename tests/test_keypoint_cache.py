@@ -0,0 +1,42 @@
+import numpy as np
+
+from keypoint_cache import KeypointCache
+
+CONFIG = {"detector": "holistic"}
+
+
+def fake_video(tmp_path, frame_count):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video")
+    calls = []
+
+    def extract(indices):
+        calls.append(list(indices))
+        return np.array([np.full(258, index) for index in indices if index < frame_count])
+
+    return str(path), extract, calls
+
+
+def test_entries_are_keyed_by_the_exact_index_set(tmp_path):
+    cache = KeypointCache(str(tmp_path / "cache"))
+    path, extract, calls = fake_video(tmp_path, 100)
+
+    cache.keypoints(path, [0, 10, 20], CONFIG, extract)
+    keypoints = cache.keypoints(path, [0, 5, 10], CONFIG, extract)
+    # An overlapping set is extracted in full, never stitched from rows of another run
+    assert calls == [[0, 10, 20], [0, 5, 10]]
+    np.testing.assert_array_equal(keypoints[:, 0], [0, 5, 10])
+
+    cache.keypoints(path, [0, 10, 20], CONFIG, extract)
+    assert len(calls) == 2 and cache.hits == 3
+
+
+def test_end_of_video_is_remembered(tmp_path):
+    cache = KeypointCache(str(tmp_path / "cache"))
+    path, extract, calls = fake_video(tmp_path, 25)
+
+    first = cache.keypoints(path, [0, 10, 20, 30, 40], CONFIG, extract)
+    again = cache.keypoints(path, [0, 10, 20, 30, 40], CONFIG, extract)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first[:, 0], [0, 10, 20])
+    np.testing.assert_array_equal(again, first)
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+
+from parallel_extraction import extract_video_keypoints, shutdown_pool, split_chunks
+from video_io import fit_frame, read_frames, sample_indices
+
+CLIP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    "benchmarks", "fixtures", "tolong_illustration.mp4")
+
+
+def test_chunks_cover_the_indices_after_their_warmup():
+    chunks = split_chunks(list(range(25)), chunk_frames=10, overlap=3)
+    assert chunks == [(list(range(0, 10)), 0), (list(range(7, 20)), 3), (list(range(17, 25)), 3)]
+
+
+def test_parallel_extraction_matches_the_sequential_path():
+    sequential = extract_video_keypoints(CLIP, workers=1, chunk_frames=30)
+    try:
+        parallel = extract_video_keypoints(CLIP, workers=2, chunk_frames=30)
+        # Other work in the same pool must not change the next result
+        extract_video_keypoints(CLIP, range(40, 60), workers=2, chunk_frames=5)
+        again = extract_video_keypoints(CLIP, workers=2, chunk_frames=30)
+    finally:
+        shutdown_pool()
+
+    assert sequential.shape == (90, 258) and sequential.any()
+    np.testing.assert_array_equal(parallel, sequential)
+    np.testing.assert_array_equal(again, sequential)
+
+
+def test_preview_frames_come_from_the_extraction_pass():
+    indices = sample_indices(90, 30)
+    keypoints, previews = extract_video_keypoints(CLIP, indices, workers=1, preview_size=(160, 90))
+    np.testing.assert_array_equal(keypoints, extract_video_keypoints(CLIP, indices, workers=1))
+    expected = [fit_frame(frame, (160, 90)) for _, frame in read_frames(CLIP, indices)]
+    assert len(previews) == len(expected) and previews[0].shape == (90, 120, 3)
+    for preview, frame in zip(previews, expected):
+        np.testing.assert_array_equal(preview, frame)
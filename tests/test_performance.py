@@ -0,0 +1,8 @@
+from performance import PerformanceMonitor, format_snapshot
+
+
+def test_drops_are_reported_per_queue():
+    queue_stats = {"detection": {"dropped": 3}, "classification": {"dropped": 1}, "display": {"dropped": 0}}
+    snapshot = PerformanceMonitor().snapshot(queue_stats)
+    assert snapshot["dropped"] == {"detection": 3, "classification": 1, "display": 0}
+    assert "dropped frames: detection 3, display 0   windows: 1" in format_snapshot(snapshot)
@@ -0,0 +1,7 @@
+from sweep import prediction_frames
+
+
+def test_first_prediction_waits_for_the_camera_interval():
+    # The camera page predicts every 30 frames once a window is full, whatever the window size
+    assert prediction_frames(5, 5)[:2] == [30, 60]
+    assert prediction_frames(30, 5)[:2] == [30, 60]
@@ -1,168 +1,258 @@
 from main import *
-
-# Load the trained LSTM model
-model = load_model('Preprocessing/models/model_windowed_seq_5.h5')
-actions = np.array(['halo', 'apa kabar', 'aku', 'kamu', 'maaf', 'tolong', 'ya', 'tidak', 'suka', 'makanan', 
-                    'selamat pagi', 'selamat siang', 'selamat sore', 'selamat malam', 'sampai jumpa lagi', 
-                    'perkenalkan', 'terima kasih', 'sama-sama', 'mau', 'tidak mau'])
-
-# Mediapipe setup
-mp_holistic = mp.solutions.holistic
-mp_drawing = mp.solutions.drawing_utils
-
-WINDOW_SIZE = 10  # Frames per window
-STRIDE = 5  # Sliding window step
-
-# Helper functions
-def mediapipe_detection(image, model):
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    image.flags.writeable = False
-    results = model.process(image)
-    image.flags.writeable = True
-    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-    return image, results
-
-def extract_keypoints(results):
-    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33 * 4)
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21 * 3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21 * 3)
-    return np.concatenate([pose, lh, rh])
-
-def draw_styled_landmarks(image, results):
-    # Draw pose connections
-    mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS,
-                             mp_drawing.DrawingSpec(color=(80,22,10), thickness=1, circle_radius=3), 
-                             mp_drawing.DrawingSpec(color=(80,44,121), thickness=1, circle_radius=2)
-                             ) 
-    # Draw left hand connections
-    mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS, 
-                             mp_drawing.DrawingSpec(color=(121,22,76), thickness=1, circle_radius=3), 
-                             mp_drawing.DrawingSpec(color=(121,44,250), thickness=1, circle_radius=1)
-                             ) 
-    # Draw right hand connections  
-    mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS, 
-                             mp_drawing.DrawingSpec(color=(245,117,66), thickness=1, circle_radius=3), 
-                             mp_drawing.DrawingSpec(color=(245,66,230), thickness=1, circle_radius=1)
-                             ) 
-
-class CameraThread(QThread):    # Windowed Sequence
-    frame_updated = Signal(np.ndarray)
-    prediction_updated = Signal(str)
-    indicator_updated = Signal(str)  # Signal for indicator (red/green)
-
-    def __init__(self):
-        super().__init__()
-        self.running = False
-        self.sequence = []
-        self.sentence = []
-        self.threshold = 0.75
-        self.frame_counter = 0  # Count total frames
-        self.processing = False  # Indicator flag
-        self.lock = threading.Lock()
-
-        self.window_size = 10  # Window size for input
-        self.stride = 5  # Stride for moving window
-        self.prediction_interval = 30  # Predict every 30 frames
-
-        # Load RealSense camera
-        self.pipeline = rs.pipeline()
-        config = rs.config()
-        config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8, 30)
-        self.pipeline.start(config)
+from keypoint_buffer import camera_buffer
+from constants import ACTIONS, MODELS_DIR, STRIDE, VIDEO_FRAMES, WINDOW_SIZE
+from performance import format_snapshot, now
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QShortcut
+import os
+from functools import partial
+from inference import load_inference_model
+import startup
+
+# Model backend settings (the model file itself is UIFunctions.MODEL_FILE)
+INFERENCE_BACKEND = "keras"  # "keras", "tflite" or "onnx" (convert first with Preprocessing/export_models.py)
+INFERENCE_MODE = "compiled"  # Keras only: "predict", "call" or "compiled" (see inference.py)
+INFERENCE_JIT = False  # XLA-compile the traced model (CPU)
+INFERENCE_QUANTIZATION = None  # None, "float16", "dynamic" or "int8" (TFLite, see Preprocessing/quantize_models.py)
+model = None  # Loaded by load_models() in the background, when the camera or video page is first opened
+
+# Frame source: "realsense", "webcam[:index]", a video file or a RealSense .bag recording (see frame_sources.py)
+FRAME_SOURCE = os.environ.get("FRAME_SOURCE", "webcam")
+ADAPTIVE_DETECTION = True  # Under load run Holistic on every k-th frame and interpolate the others
+SHOW_LANDMARKS = False  # Skeleton overlay on the camera and video previews, toggled with F4
+SHOW_VIDEO_PREVIEW = True  # Loop the sampled frames of a detected video under the upload row
+VIDEO_PREVIEW_SIZE = (480, 270)  # Bounds of the video page's preview
+
+# Heavy modules, imported in this order in the background instead of at startup (see startup.py)
+RUNTIME_MODULES = ["cv2", "mediapipe"] + (["tensorflow"] if INFERENCE_BACKEND == "keras" else []) + [
+    "detection", "frame_sources", "video_io", "landmark_overlay", "camera_thread", "video_processing"]
+
+def load_models(model_file):
+    """ Runs in the RuntimeLoader thread, after RUNTIME_MODULES were imported. """
+    global model
+    model = load_inference_model(os.path.join(MODELS_DIR, model_file), backend=INFERENCE_BACKEND,
+                                 mode=INFERENCE_MODE, jit_compile=INFERENCE_JIT, quantization=INFERENCE_QUANTIZATION)
+
+class VideoPreviewLoader(QThread):
+    """ Decodes and scales the sampled frames of a video for the preview, off the GUI thread. """
+    loaded = Signal(object, list)  # (video, RGB frames)
+
+    def __init__(self, video, parent=None):
+        super().__init__(parent)
+        self.video = video
 
     def run(self):
-        with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-            self.running = True
-
-            while self.running:
-                frames = self.pipeline.wait_for_frames()
-                color_frame = frames.get_color_frame()
-                if not color_frame:
-                    continue
-
-                frame = np.asanyarray(color_frame.get_data())
-                self.frame_counter += 1  # Count total frames
-                
-                # Capture keypoints every frame
-                image, results = mediapipe_detection(frame, holistic)
-                keypoints = extract_keypoints(results)
-
-                with self.lock:
-                    self.sequence.append(keypoints)
-                    if len(self.sequence) > self.window_size:
-                        self.sequence.pop(0)  # Keep last `window_size` frames
-
-                # Predict every 30 frames
-                if self.frame_counter % self.prediction_interval == 0 and len(self.sequence) == self.window_size:
-                    self.processing = True  # Start processing
-                    self.indicator_updated.emit("red")  # Set indicator to red
-
-                    prediction = model.predict(np.expand_dims(self.sequence, axis=0))[0]
-                    predicted_action = actions[np.argmax(prediction)]
+        import video_processing
+        self.loaded.emit(self.video, video_processing.preview_frames(self.video, VIDEO_PREVIEW_SIZE))
 
-                    if prediction[np.argmax(prediction)] > self.threshold:
-                        if len(self.sentence) == 0 or predicted_action != self.sentence[-1]:
-                            self.sentence.append(predicted_action)
-                        self.sentence = self.sentence[-5:]
+class UIFunctions(MainWindow):
+    """ Camera and video pages with the windowed LSTM; ui_functions_CNN.py overrides the model-specific part. """
 
-                    self.prediction_updated.emit(' '.join(self.sentence))
+    MODEL_FILE = 'model_windowed_seq_5.h5'
+    # Batch sizes the model sees, run once on zeros before the first prediction:
+    # a camera window, and every window of an uploaded video at once
+    WARMUP_BATCHES = (1, len(range(0, VIDEO_FRAMES - WINDOW_SIZE + 1, STRIDE)))
+    IDLE_INDICATOR = u"background-color: rgb(255, 157, 218);"
 
-                    # Maintain stride: keep last `stride` frames
-                    with self.lock:
-                        self.sequence = self.sequence[-self.stride:]
+    def camera_buffer(self):
+        """ Windowed Sequence: predict every 30 frames on the last 10. """
+        return camera_buffer()
 
-                    self.processing = False  # Resume frame capture
-                    self.indicator_updated.emit("green")  # Set indicator to green
+    def window_input(self, window):
+        """ Model input of one camera window: (1, 10, 258). """
+        return window[np.newaxis]
 
-                self.frame_updated.emit(frame)
+    def video_input(self, keypoints):
+        """ Model input of a video's sampled keypoints: (num_windows, 10, 258), or None if the video is too short. """
+        import video_processing
+        return video_processing.lstm_input(keypoints)
 
-    def stop(self):
-        self.running = False
-        self.pipeline.stop()
-        self.quit()
-        self.wait()
+    def predict_window(self, window):
+        """ Class probabilities of one camera window, in the classification stage. """
+        return model.predict(self.window_input(window))[0]
 
-class UIFunctions(MainWindow):
+    def create_camera_thread(self):
+        from camera_thread import CameraThread
+        from frame_sources import open_source
+        return CameraThread(open_source(FRAME_SOURCE), self.camera_buffer(), self.predict_window, ACTIONS,
+                            adaptive=ADAPTIVE_DETECTION, detectors=self.detectors)
 
     def __init__(self, main_window):
         self.main_window = main_window  # Reference to MainWindow
         self.ui = main_window.ui
         self.camera_thread = None
 
+        # Performance overlay on the camera view, toggled with F3
+        self.performance_overlay = QLabel(self.ui.camera_box)
+        self.performance_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: white; font-family: monospace; padding: 4px;")
+        self.performance_overlay.hide()
+        self.performance_shortcut = QShortcut(QKeySequence("F3"), main_window)
+        self.performance_shortcut.activated.connect(self.toggle_performance_overlay)
+
+        # OpenCV, MediaPipe, TensorFlow and the model load in the background the first
+        # time the camera or video page is opened, then warm up; their buttons wait for it
+        self.runtime_loader = None
+        self.warm_up = None
+        self.detectors = None  # DetectorReserve: a warmed-up detector for the next camera start
+        self.runtime_buttons = (self.ui.btn_open_camera, self.ui.btn_video_upload, self.ui.btn_detection)
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setMaximumWidth(250)
+        self.loading_bar.hide()
+        main_window.statusBar().addPermanentWidget(self.loading_bar)
+        self.ui.stackedWidget.currentChanged.connect(self.page_changed)
+
+        # Landmark overlay on both previews, toggled with F4
+        self.show_landmarks = SHOW_LANDMARKS
+        self.landmarks_shortcut = QShortcut(QKeySequence("F4"), main_window)
+        self.landmarks_shortcut.activated.connect(self.toggle_landmarks)
+
+        # Video page: the sampled frames of the detected video, looped under the upload row
+        self.video_preview = QLabel(self.ui.frame_content_page_3)
+        self.video_preview.setAlignment(Qt.AlignCenter)
+        self.video_preview.setMinimumHeight(VIDEO_PREVIEW_SIZE[1])
+        self.video_preview.hide()
+        self.ui.verticalLayout_11.insertWidget(1, self.video_preview)
+        self.video_keypoints = None  # Keypoints of the sampled frames, one row per preview frame
+        self.video_preview_frames = None  # Sampled frames without the overlay, None until they are decoded
+        self.video_preview_shown = []  # The same frames as shown, with the overlay if it's on
+        self.video_preview_index = 0
+        self.video_preview_timer = QTimer(main_window)
+        self.video_preview_timer.timeout.connect(self.next_video_preview_frame)
+
+        # Repaint the preview with the newest frame at the display refresh rate
+        refresh_rate = main_window.screen().refreshRate() or 60
+        self.repaint_timer = QTimer(main_window)
+        self.repaint_timer.setInterval(max(1, round(1000 / refresh_rate)))
+        self.repaint_timer.timeout.connect(self.update_camera_feed)
+
         # Connect buttons
         self.ui.btn_open_camera.clicked.connect(self.start_camera)
         self.ui.btn_close_camera.clicked.connect(self.stop_camera)
         self.ui.btn_video_upload.clicked.connect(self.upload_video)
         self.ui.btn_detection.clicked.connect(self.process_and_predict_video)
 
+    def page_changed(self, index):
+        if self.ui.stackedWidget.widget(index) in (self.ui.page_2, self.ui.page_3):
+            self.load_runtime()
+
+    def load_runtime(self):
+        """ Start loading RUNTIME_MODULES and the model, once (again after a failure). """
+        if self.runtime_loader is not None:
+            return
+        self.ui.label_content_text_display.clear()
+        self.ui.label_content_text_display_2.clear()
+        for button in self.runtime_buttons:
+            button.setEnabled(False)
+        self.runtime_loader = startup.RuntimeLoader(RUNTIME_MODULES, partial(load_models, self.MODEL_FILE))
+        self.runtime_loader.progress.connect(self.update_loading_progress)
+        self.runtime_loader.loaded.connect(self.runtime_loaded)
+        self.runtime_loader.failed.connect(self.runtime_failed)
+        self.loading_bar.show()
+        self.runtime_loader.start()
+
+    def update_loading_progress(self, step, percent):
+        self.loading_bar.setValue(percent)
+        self.main_window.statusBar().showMessage(step)
+
+    def runtime_loaded(self):
+        """ Warm up the model and a detector before enabling the buttons. """
+        from detection import DetectorReserve
+        startup.mark("runtime_loaded")
+        self.main_window.statusBar().showMessage("Warming up")
+        self.loading_bar.setRange(0, 0)  # Busy
+        self.detectors = DetectorReserve()
+        self.warm_up = startup.WarmUp(model, self.WARMUP_BATCHES, self.detectors)
+        self.warm_up.hot.connect(self.runtime_hot)
+        self.warm_up.failed.connect(self.warm_up_failed)
+        self.warm_up.start()
+
+    def runtime_hot(self, timings):
+        startup.mark("hot")
+        self.runtime_ready("Ready")
+
+    def warm_up_failed(self, message):
+        """ Still usable: only the first prediction is slower. """
+        self.runtime_ready(f"Ready, warm-up failed: {message}")
+
+    def runtime_ready(self, message):
+        self.loading_bar.hide()
+        self.loading_bar.setRange(0, 100)
+        self.main_window.statusBar().showMessage(message, 5000)
+        for button in self.runtime_buttons:
+            button.setEnabled(True)
+
+    def runtime_failed(self, message):
+        """ Show the error on both pages; opening one of them again retries. """
+        self.runtime_loader = None
+        self.loading_bar.hide()
+        error = f"Loading failed: {message}"
+        self.main_window.statusBar().showMessage(error)
+        self.ui.label_content_text_display.setText(error)
+        self.ui.label_content_text_display_2.setText(error)
+
+    def rewarm_detector(self):
+        """ The camera closed its detector: warm the next one in the background. """
+        if self.warm_up is not None and self.warm_up.isRunning():
+            return
+        self.warm_up = startup.WarmUp(reserve=self.detectors)
+        self.warm_up.start()
+
     def start_camera(self):
         """ Start the camera only if page_2 is active. """
         if self.ui.stackedWidget.currentWidget() == self.ui.page_2:
-            self.camera_thread = CameraThread()
-            self.camera_thread.frame_updated.connect(self.update_camera_feed)
+            self.camera_thread = self.create_camera_thread()
             self.camera_thread.prediction_updated.connect(self.update_prediction_label)
             self.camera_thread.indicator_updated.connect(self.update_indicator)
+            self.camera_thread.failed.connect(self.camera_failed)
+            self.camera_thread.performance_updated.connect(self.update_performance_overlay)
+            self.camera_thread.monitor.enabled = self.performance_overlay.isVisible()
+            self.camera_thread.display_size = (self.ui.camera_box.width(), self.ui.camera_box.height())
+            self.camera_thread.show_landmarks = self.show_landmarks
             self.camera_thread.running = True
             self.camera_thread.start()
+            self.repaint_timer.start()
 
     def stop_camera(self):
         """ Stop the camera and clear the QLabel display. """
         if self.camera_thread:
+            self.repaint_timer.stop()
             self.camera_thread.stop()
             self.camera_thread = None
+            self.rewarm_detector()
             self.ui.camera_box.clear()
-            self.ui.indicator.setStyleSheet(u"background-color: rgb(255, 157, 218);")
-
-    def update_camera_feed(self, image):
-        """ Update QLabel with camera feed. """
-        frame_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        height, width, channel = frame_rgb.shape
-        bytes_per_line = channel * width
-        qimage = QImage(frame_rgb.data, width, height, bytes_per_line, QImage.Format_RGB888)
+            self.performance_overlay.clear()
+            self.ui.indicator.setStyleSheet(self.IDLE_INDICATOR)
+
+    def camera_failed(self, message):
+        """ A stage of the camera thread raised: stop the camera and show why. """
+        self.stop_camera()
+        self.ui.label_content_text_display.setText(message)
+
+    def update_camera_feed(self):
+        """ Update QLabel with the newest camera frame, if there is a new one. """
+        if not self.camera_thread:
+            return
+        item = self.camera_thread.mailbox.take()
+        if item is None:
+            return
+        image, captured_at = item
+        monitor = self.camera_thread.monitor
+        timing = monitor.enabled
+        if timing:
+            start = time.perf_counter()
+        # Frame sources deliver RGB: wrap the frame's own buffer, no conversion
+        height, width, channel = image.shape
+        qimage = QImage(image.data, width, height, image.strides[0], QImage.Format_RGB888)
         self.ui.camera_box.setPixmap(QPixmap.fromImage(qimage))
+        self.camera_thread.release_frame(image)  # QPixmap.fromImage copied it
+        if timing:
+            monitor.add("ui_delivery", time.perf_counter() - start)
+            monitor.add("end_to_end", now() - captured_at)
 
     def update_prediction_label(self, text):
         """ Update QLabel with predictions. """
+        startup.mark("first_prediction")
         self.ui.label_content_text_display.setText(text)
 
     def update_indicator(self, color):
@@ -171,28 +261,107 @@ class UIFunctions(MainWindow):
         else:
             self.ui.indicator.setStyleSheet("background-color: green;")
 
+    def toggle_performance_overlay(self):
+        """ Show/hide the performance overlay; timings are only collected while it is shown. """
+        visible = not self.performance_overlay.isVisible()
+        self.performance_overlay.setVisible(visible)
+        if self.camera_thread:
+            self.camera_thread.monitor.reset()
+            self.camera_thread.monitor.enabled = visible
+        if visible:
+            self.performance_overlay.setText("Collecting...")
+            self.performance_overlay.adjustSize()
+            self.performance_overlay.raise_()
+
+    def update_performance_overlay(self, snapshot):
+        if self.performance_overlay.isVisible():
+            self.performance_overlay.setText(format_snapshot(snapshot))
+            self.performance_overlay.adjustSize()
+
+    def toggle_landmarks(self):
+        """ Show/hide the skeleton overlay on the camera preview and the video preview. """
+        self.show_landmarks = not self.show_landmarks
+        if self.camera_thread:
+            self.camera_thread.show_landmarks = self.show_landmarks
+        self.draw_video_preview()
+
+    def start_video_preview(self, video):
+        """ Loop the sampled frames of the detected video, spaced as they are in the video.
+
+        The frames kept from the keypoint extraction are used as they are; when the
+        keypoints came from the cache they are decoded in a VideoPreviewLoader first.
+        """
+        self.video_preview_timer.stop()
+        if not SHOW_VIDEO_PREVIEW:
+            return
+        if self.video_preview_frames is None:
+            loader = VideoPreviewLoader(video, self.main_window)  # Owned by the window until it finishes
+            loader.loaded.connect(self.video_preview_loaded)
+            loader.finished.connect(loader.deleteLater)
+            loader.start()
+            return
+        self.draw_video_preview()
+        if not self.video_preview_frames:
+            self.video_preview.hide()
+            return
+        duration_ms = 1000 * len(video) / video.fps
+        self.video_preview_timer.setInterval(max(33, round(duration_ms / len(self.video_preview_frames))))
+        self.video_preview_index = 0
+        self.video_preview.show()
+        self.next_video_preview_frame()
+        self.video_preview_timer.start()
+
+    def video_preview_loaded(self, video, frames):
+        if video is not self.main_window.video_data or self.video_keypoints is None:
+            return  # Another video was uploaded meanwhile
+        self.video_preview_frames = frames
+        self.start_video_preview(video)
+
+    def stop_video_preview(self):
+        self.video_preview_timer.stop()
+        self.video_preview.clear()
+        self.video_preview.hide()
+        self.video_keypoints = self.video_preview_frames = None
+        self.video_preview_shown = []
+
+    def draw_video_preview(self):
+        """ Draw the overlay once on copies of the preview frames, not on every repaint. """
+        if not self.video_preview_frames:
+            self.video_preview_shown = []
+        elif self.show_landmarks and self.video_keypoints is not None:
+            from landmark_overlay import draw_keypoints
+            self.video_preview_shown = [draw_keypoints(frame.copy(), keypoints)
+                                        for frame, keypoints in zip(self.video_preview_frames, self.video_keypoints)]
+        else:
+            self.video_preview_shown = self.video_preview_frames
+
+    def next_video_preview_frame(self):
+        if not self.video_preview_shown:
+            return
+        image = self.video_preview_shown[self.video_preview_index % len(self.video_preview_shown)]
+        height, width, channel = image.shape
+        qimage = QImage(image.data, width, height, image.strides[0], QImage.Format_RGB888)
+        self.video_preview.setPixmap(QPixmap.fromImage(qimage))
+        self.video_preview_index += 1
+
     def upload_video(self):
-        """Opens a file dialog to select a video and stores frames in memory."""
+        """Opens a file dialog to select a video and keeps a handle to it (no frames in memory)."""
         file_dialog = QFileDialog()
         file_path, _ = file_dialog.getOpenFileName(None, "Select Video", "", "Video Files (*.mp4 *.avi *.mov)")
 
         if file_path:
             self.ui.label_video_text.setText(file_path.split("/")[-1])  # Show filename in UI
-            self.main_window.video_data = self.load_video(file_path)
+            try:
+                self.main_window.video_data = self.load_video(file_path)
+            except IOError as error:  # Not a video OpenCV can open
+                self.main_window.video_data = None
+                self.ui.label_content_text_display_2.setText(str(error))
+            self.stop_video_preview()
 
     def load_video(self, video_path):
-        """Reads video frames into memory without saving it locally."""
-        cap = cv2.VideoCapture(video_path)
-        frames = []
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            frames.append(frame)
-
-        cap.release()
-        return frames
+        """Reads the video metadata (path, frame count, fps); frames are decoded only on detection."""
+        from video_io import open_video
+        return open_video(video_path)
 
     def process_and_predict_video(self):
         """Processes the uploaded video, extracts keypoints, and makes predictions."""
@@ -200,62 +369,34 @@ class UIFunctions(MainWindow):
             self.ui.label_content_text_display_2.setText("Please upload a video first.")
             return
 
-        # Convert frames to LSTM input
-        lstm_input = self.process_video_to_lstm_input(self.main_window.video_data)
+        # Convert frames to the model's input
+        model_input = self.process_video_to_model_input(self.main_window.video_data)
 
         # Predict using the trained model
-        prediction_label, _ = self.predict_video(lstm_input)
+        prediction_label, _ = self.predict_video(model_input)
 
         # Display result
         self.ui.label_content_text_display_2.setText(prediction_label)
-
-    def process_video_to_lstm_input(self, video_frames, target_frame_count=30):
-        """Processes a list of frames, extracts MediaPipe landmarks, and formats input for LSTM."""
-        frame_count = len(video_frames)
-        frame_interval = frame_count // target_frame_count if frame_count > target_frame_count else 1
-        frames_data = []
-
-        mp_holistic = mp.solutions.holistic
-        with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-            for i in range(target_frame_count):
-                frame_idx = i * frame_interval
-                if frame_idx >= frame_count:
-                    break
-
-                frame = video_frames[frame_idx]
-
-                # Extract landmarks from the frame
-                image, results = mediapipe_detection(frame, holistic)
-                keypoints = extract_keypoints(results)
-                frames_data.append(keypoints)
-
-        # Convert to numpy array
-        frames_data = np.array(frames_data)  # Shape: (frame_count, 258)
-
-        # Apply sliding window approach
-        X_video = []
-        for start in range(0, len(frames_data) - WINDOW_SIZE + 1, STRIDE):
-            window = frames_data[start:start + WINDOW_SIZE]  # Shape: (10, 258)
-            X_video.append(window)
-
-        if not X_video:  # If the video is too short
-            return None  # or handle padding
-
-        return np.array(X_video)  # Shape: (num_windows, 10, 258)
-
-    def predict_video(self, lstm_input):
-        """Predicts the sign language gesture from processed LSTM input."""
-        if lstm_input is None:
-            return "Insufficient Frames", None  # Handle short videos
-
-        lstm_input = np.array(lstm_input)  # Ensure it's an array
-        predictions = model.predict(lstm_input)  # Shape: (num_windows, num_classes)
-
-        # Aggregate predictions (e.g., majority vote or average probabilities)
-        avg_prediction = np.mean(predictions, axis=0)  # Averaging over windows
-        predicted_class = np.argmax(avg_prediction)  # Highest probability class index
-        predicted_label = actions[predicted_class]  # Convert to class label
-
+        startup.mark("first_prediction")
+        self.start_video_preview(self.main_window.video_data)
+
+    def process_video_to_model_input(self, video, target_frame_count=30):
+        """Decodes only the sampled frames of a video, extracts MediaPipe landmarks, and formats the model input."""
+        import video_processing
+        self.stop_video_preview()
+        if SHOW_VIDEO_PREVIEW:
+            # Keypoints and the frames they were extracted from, both kept for the preview
+            self.video_keypoints, self.video_preview_frames = video_processing.video_keypoints(
+                video, target_frame_count, preview_size=VIDEO_PREVIEW_SIZE)
+        else:
+            self.video_keypoints = video_processing.video_keypoints(video, target_frame_count)
+        return self.video_input(self.video_keypoints)
+
+    def predict_video(self, model_input):
+        """Predicts the sign language gesture from the processed model input."""
+        import video_processing
+        # Averages the class probabilities over the windows
+        predicted_label, avg_prediction, _ = video_processing.predict_video(model, model_input, ACTIONS)
         return predicted_label, avg_prediction
 
     def toggleMenu(self, maxWidth, enable):
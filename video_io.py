@@ -0,0 +1,91 @@
+import cv2
+
+SEEK_THRESHOLD = 30  # Seek instead of grabbing when the next sampled frame is further away than this
+
+
+class VideoHandle:
+    """Lightweight reference to an uploaded video: path and metadata, no decoded frames."""
+
+    def __init__(self, path, frame_count, fps, width, height):
+        self.path = path
+        self.frame_count = frame_count
+        self.fps = fps
+        self.width = width
+        self.height = height
+
+    def __len__(self):
+        return self.frame_count
+
+    def __repr__(self):
+        return f"VideoHandle({self.path!r}, frames={self.frame_count}, fps={self.fps:.1f}, {self.width}x{self.height})"
+
+
+def open_video(path):
+    """Read the metadata of a video file; frames are only decoded if the container doesn't store their count."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {path}")
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frame_count <= 0:
+            # Some containers don't store the count: grab every frame (decoded, but never converted or copied)
+            frame_count = 0
+            while cap.grab():
+                frame_count += 1
+        return VideoHandle(path, frame_count, cap.get(cv2.CAP_PROP_FPS) or 30.0,
+                           int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+
+
+def sample_indices(frame_count, target_frame_count=30):
+    """Evenly spaced frame indices, the same ones the video page always sampled."""
+    frame_interval = frame_count // target_frame_count if frame_count > target_frame_count else 1
+    return [i * frame_interval for i in range(target_frame_count) if i * frame_interval < frame_count]
+
+
+def fit_frame(frame, size):
+    """RGB copy of a BGR `frame` scaled to fit in `size` (width, height), for previews."""
+    width, height = size
+    scale = min(width / frame.shape[1], height / frame.shape[0])
+    frame = cv2.resize(frame, (round(frame.shape[1] * scale), round(frame.shape[0] * scale)),
+                       interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def read_frames(video, indices, seek_threshold=SEEK_THRESHOLD):
+    """Yield (index, frame) for the sorted `indices` only, one decoded frame in memory at a time.
+
+    Frames between two samples are skipped with `grab()`, which still decodes them
+    with the FFmpeg backend but skips the BGR conversion and the copy, or by
+    seeking when the gap is large and the container supports accurate seeking.
+    """
+    path = video.path if isinstance(video, VideoHandle) else video
+    cap = cv2.VideoCapture(path)
+    position = 0  # Index of the frame the next grab() returns
+    can_seek = True
+    try:
+        for index in indices:
+            if index - position > seek_threshold and can_seek:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == index:
+                    position = index
+                else:
+                    # Inexact seeking: go back to grabbing from a known position
+                    can_seek = False
+                    cap.release()
+                    cap = cv2.VideoCapture(path)
+                    position = 0
+
+            while position < index:
+                if not cap.grab():
+                    return
+                position += 1
+
+            ret, frame = cap.read()
+            if not ret:
+                return
+            position += 1
+            yield index, frame
+    finally:
+        cap.release()
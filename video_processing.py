@@ -0,0 +1,88 @@
+"""Video page pipeline without the GUI: sampled frames -> keypoints -> model input -> prediction.
+
+Shared by the UI functions modules and the headless `classify_videos.py`;
+it imports neither PySide6 nor pyrealsense2.
+"""
+import numpy as np
+
+from constants import ACTIONS, STRIDE, VIDEO_FRAMES, WINDOW_SIZE
+from detection import detector_config
+from keypoint_cache import default_cache
+from keypoints import N_KEYPOINTS
+from parallel_extraction import extract_video_keypoints
+from video_io import VideoHandle, fit_frame, read_frames, sample_indices
+
+
+def video_keypoints(video, target_frame_count=VIDEO_FRAMES, workers=None, cache=True, preview_size=None):
+    """Keypoints of the evenly sampled frames: (frame_count, 258).
+
+    With `cache` (True for the default KeypointCache, or a KeypointCache) the
+    keypoints of a file already sampled the same way with the same detector
+    settings are read from disk instead of running Holistic again.
+
+    With `preview_size` returns (keypoints, frames): the sampled frames as
+    `preview_frames` gives them, kept from the extraction pass, or None when the
+    keypoints came from the cache and no frame was decoded.
+    """
+    indices = sample_indices(len(video), target_frame_count)
+    previews = None
+
+    def extract(indices):
+        nonlocal previews
+        if not preview_size:
+            return extract_video_keypoints(video, indices, workers=workers)
+        keypoints, previews = extract_video_keypoints(video, indices, workers=workers, preview_size=preview_size)
+        return keypoints
+
+    if not cache:
+        keypoints = extract(indices)
+    else:
+        cache = default_cache() if cache is True else cache
+        path = video.path if isinstance(video, VideoHandle) else video
+        keypoints = cache.keypoints(path, indices, detector_config(), extract)
+    return (keypoints, previews) if preview_size else keypoints
+
+
+def preview_frames(video, size, target_frame_count=VIDEO_FRAMES):
+    """The evenly sampled frames (the rows of `video_keypoints`) as RGB, scaled to fit in `size` (width, height)."""
+    return [fit_frame(frame, size) for _, frame in read_frames(video, sample_indices(len(video), target_frame_count))]
+
+
+def lstm_input(frames_data, window_size=WINDOW_SIZE, stride=STRIDE):
+    """Sliding windows over the frames: (num_windows, window_size, 258), or None if the video is too short."""
+    starts = range(0, len(frames_data) - window_size + 1, stride)
+    if not starts:
+        return None
+    return np.array([frames_data[start:start + window_size] for start in starts])
+
+
+def cnn_input(frames_data, target_frame_count=VIDEO_FRAMES):
+    """The frames zero-padded to `target_frame_count`: (1, 30, 258, 1) float32."""
+    padded = np.zeros((target_frame_count, N_KEYPOINTS), dtype=np.float32)
+    padded[:len(frames_data)] = frames_data[:target_frame_count]
+    return padded.reshape(1, target_frame_count, N_KEYPOINTS, 1)
+
+
+def process_video_to_lstm_input(video, target_frame_count=VIDEO_FRAMES, workers=None, cache=True):
+    return lstm_input(video_keypoints(video, target_frame_count, workers, cache))
+
+
+def process_video_to_cnn_input(video, target_frame_count=VIDEO_FRAMES, workers=None, cache=True):
+    return cnn_input(video_keypoints(video, target_frame_count, workers, cache), target_frame_count)
+
+
+def model_input(frames_data, input_shape):
+    """LSTM windows or the padded CNN input, whichever `input_shape` (without batch) expects."""
+    if len(input_shape) == 3:
+        return cnn_input(frames_data, input_shape[0])
+    return lstm_input(frames_data, window_size=input_shape[0])
+
+
+def predict_video(model, model_input, actions=ACTIONS):
+    """(label, avg_prediction, predictions): per-window probabilities averaged over the windows."""
+    if model_input is None:
+        return "Insufficient Frames", None, None  # Handle short videos
+
+    predictions = model.predict(np.asarray(model_input))  # Shape: (num_windows, num_classes)
+    avg_prediction = np.mean(predictions, axis=0)  # Averaging over windows
+    return actions[int(np.argmax(avg_prediction))], avg_prediction, predictions